@@ -0,0 +1,37 @@
+"""Add partial index for stuck pending job scans
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-16 04:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Partial index for process_pending_jobs (only pending rows are indexed)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_jobs_pending_created_at',
+            'jobs',
+            ['created_at'],
+            postgresql_where=sa.text("status = 'pending'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_jobs_pending_created_at',
+            table_name='jobs',
+            postgresql_concurrently=True,
+        )
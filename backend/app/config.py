@@ -45,6 +45,7 @@ class Settings(BaseSettings):
     redis_url: str = "redis://localhost:6379/0"
     celery_broker_url: str = "redis://localhost:6379/1"
     celery_result_backend: str = "redis://localhost:6379/2"
+    celery_prefetch_multiplier: int = 1  # Long I/O-bound tasks: reserve one at a time
 
     # S3/MinIO
     s3_endpoint: str = "http://localhost:9000"  # Internal endpoint for backend
@@ -53,12 +54,14 @@ class Settings(BaseSettings):
     s3_secret_key: str = "neura_minio_password"
     s3_bucket: str = "neura-storage"
     s3_region: str = "us-east-1"
+    s3_sync_fast_path: bool = False  # Serve small S3 calls via sync boto3 in a thread
 
     # JWT
     jwt_secret_key: str = "dev-secret-key-change-in-production-minimum-32-chars"
     jwt_algorithm: str = "HS256"
     jwt_access_token_expire_minutes: int = 30
     jwt_refresh_token_expire_days: int = 7
+    bcrypt_rounds: int = 12
 
     # LLM
     llm_provider: str = "lmstudio"
@@ -73,6 +76,11 @@ class Settings(BaseSettings):
     # Avatar Service
     avatar_service_url: str = "http://localhost:8002"
 
+    # Emotion detection: ML classifier (batched across concurrent jobs) instead
+    # of keyword matching, optionally served from an int8 ONNX export
+    emotion_use_ml: bool = False
+    emotion_onnx_model_path: Optional[str] = None
+
 
     # CORS
     cors_origins: str = "http://localhost:3000"
@@ -1,7 +1,9 @@
 """Database connection and session management."""
+import os
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Awaitable, Callable
 
+import orjson
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -18,13 +20,27 @@ class Base(DeclarativeBase):
     pass
 
 
+def _json_serializer(value: Any) -> str:
+    """Serialize JSON columns with orjson (UUIDs and datetimes handled natively)."""
+    return orjson.dumps(value, default=str).decode()
+
+
 # Create async engine
+# Connections are recycled on a timer instead of pinged on every checkout, and
+# asyncpg's prepared statement caches are sized for the handful of hot queries.
 engine = create_async_engine(
     settings.db_url,
     echo=settings.debug,
-    pool_pre_ping=True,
-    pool_size=10,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    pool_pre_ping=False,
+    pool_recycle=1800,
+    pool_size=max((os.cpu_count() or 1) * 2, 10),
     max_overflow=20,
+    connect_args={
+        "statement_cache_size": 1024,
+        "prepared_statement_cache_size": 256,
+    },
 )
 
 # Session factory
@@ -37,16 +53,35 @@ async_session_maker = async_sessionmaker(
 )
 
 
+def run_after_commit(session: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """
+    Run an async callback once the session's transaction has committed.
+    
+    Used for side effects that must not be seen before the data is, e.g.
+    dropping a cached row: invalidating before the commit lets a concurrent
+    reader re-cache the old row. Callbacks are dropped on rollback.
+    """
+    session.info.setdefault("after_commit", []).append(callback)
+
+
+async def _commit(session: AsyncSession) -> None:
+    """Commit, then run the callbacks registered with run_after_commit."""
+    await session.commit()
+    for callback in session.info.pop("after_commit", []):
+        await callback()
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency for getting database sessions."""
     async with async_session_maker() as session:
         try:
             yield session
-            await session.commit()
+            await _commit(session)
         except Exception:
             await session.rollback()
             raise
         finally:
+            session.info.pop("after_commit", None)
             await session.close()
 
 
@@ -56,11 +91,12 @@ async def get_db_context() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
         try:
             yield session
-            await session.commit()
+            await _commit(session)
         except Exception:
             await session.rollback()
             raise
         finally:
+            session.info.pop("after_commit", None)
             await session.close()
 
 
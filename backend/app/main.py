@@ -11,10 +11,18 @@ from fastapi.responses import JSONResponse
 
 from app.config import settings
 from app.database import close_db, init_db
-from app.middleware import RateLimitMiddleware, SecurityMiddleware
+from app.middleware import (
+    AuthMiddleware,
+    RateLimitMiddleware,
+    RequestContextMiddleware,
+    SecurityMiddleware,
+)
 from app.routers import auth, avatars, jobs, live, llm, tts, users, videos, monitoring
+from app.utils.job_progress import job_progress
 from app.utils.logging import setup_logging
-from app.utils.monitoring import MetricsMiddleware, init_sentry, capture_exception
+from app.utils.monitoring import MetricsMiddleware, init_sentry, capture_exception, flush_metrics
+from app.utils.storage import storage_client
+from app.utils.user_cache import user_cache
 
 # Setup structured logging
 setup_logging()
@@ -38,6 +46,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("Shutting down NEURA backend")
     await close_db()
     logger.info("Database connections closed")
+    await user_cache.close()
+    await job_progress.close()
+    await storage_client.close()
+    flush_metrics()
 
 
 # Create FastAPI application
@@ -66,6 +78,7 @@ app.add_middleware(
         "X-RateLimit-Limit",
         "X-RateLimit-Remaining",
         "X-RateLimit-Reset",
+        "X-Request-ID",
     ],
 )
 
@@ -92,6 +105,12 @@ app.add_middleware(
 # 6. Prometheus metrics collection
 app.add_middleware(MetricsMiddleware)
 
+# 7. Bearer token verification (once per request, before rate limiting)
+app.add_middleware(AuthMiddleware)
+
+# 8. Request logging context (request_id bound for all downstream logs)
+app.add_middleware(RequestContextMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(users.router, prefix="/api/v1/users", tags=["Users"])
@@ -1,5 +1,7 @@
 """Middleware package for NEURA backend."""
+from .auth import AuthMiddleware
 from .rate_limiter import RateLimitMiddleware, RATE_LIMITS
+from .request_context import RequestContextMiddleware
 from .security import (
     SecurityMiddleware,
     InputValidator,
@@ -16,8 +18,10 @@ from .security import (
 )
 
 __all__ = [
+    "AuthMiddleware",
     "RateLimitMiddleware",
     "RATE_LIMITS",
+    "RequestContextMiddleware",
     "SecurityMiddleware",
     "InputValidator",
     "SQLInjectionProtection",
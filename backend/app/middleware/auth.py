@@ -0,0 +1,33 @@
+"""Bearer token pre-verification middleware."""
+import structlog
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.utils.security import verify_token
+
+logger = structlog.get_logger()
+
+
+class AuthMiddleware(BaseHTTPMiddleware):
+    """
+    Verify the bearer token once per request.
+    
+    The decoded access-token payload is stored on ``request.state`` so auth
+    dependencies don't re-verify the signature, and the rate limiter can key
+    on ``request.state.user_id``. Loading the User itself stays in the
+    dependencies, which share the endpoint's database session.
+    """
+    
+    async def dispatch(self, request: Request, call_next):
+        """Decode the Authorization header, if any, into request state."""
+        authorization = request.headers.get("Authorization")
+        
+        if authorization:
+            scheme, _, token = authorization.partition(" ")
+            if scheme.lower() == "bearer" and token:
+                payload = verify_token(token, token_type="access")
+                request.state.token_payload = payload
+                if payload:
+                    request.state.user_id = payload.get("sub")
+        
+        return await call_next(request)
@@ -0,0 +1,29 @@
+"""Request-scoped logging context middleware."""
+from uuid import uuid4
+
+import structlog
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+
+class RequestContextMiddleware(BaseHTTPMiddleware):
+    """
+    Bind per-request logging context once.
+    
+    Every log call made while handling the request inherits ``request_id``
+    (and ``user_id`` once authentication resolves the user), so endpoints
+    don't have to repeat them.
+    """
+    
+    async def dispatch(self, request: Request, call_next):
+        """Reset logging context and tag the request with an ID."""
+        request_id = request.headers.get(REQUEST_ID_HEADER) or uuid4().hex
+        
+        structlog.contextvars.clear_contextvars()
+        structlog.contextvars.bind_contextvars(request_id=request_id)
+        
+        response = await call_next(request)
+        response.headers[REQUEST_ID_HEADER] = request_id
+        return response
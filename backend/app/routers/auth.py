@@ -17,10 +17,11 @@ from app.schemas.auth import (
     TokenResponse,
 )
 from app.utils.security import (
+    aget_password_hash,
+    averify_password,
     create_access_token,
     create_refresh_token,
-    get_password_hash,
-    verify_password,
+    hash_secret,
     verify_token,
 )
 
@@ -48,7 +49,7 @@ async def register(
     # Create new user
     user = User(
         email=data.email,
-        password_hash=get_password_hash(data.password),
+        password_hash=await aget_password_hash(data.password),
         name=data.name,
         credits=100,  # Free starter credits
     )
@@ -59,10 +60,10 @@ async def register(
     access_token = create_access_token(user.id, user.email)
     refresh_token = create_refresh_token(user.id)
     
-    # Store refresh token in session
+    # Store the refresh token's hash in the session, never the token itself
     session = Session.create_session(
         user_id=user.id,
-        refresh_token=refresh_token,
+        refresh_token=hash_secret(refresh_token),
         expires_days=settings.jwt_refresh_token_expire_days,
         ip_address=request.client.host if request.client else None,
         user_agent=request.headers.get("user-agent"),
@@ -93,7 +94,7 @@ async def login(
     result = await db.execute(select(User).where(User.email == data.email))
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(data.password, user.password_hash):
+    if not user or not await averify_password(data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -109,10 +110,10 @@ async def login(
     access_token = create_access_token(user.id, user.email)
     refresh_token = create_refresh_token(user.id)
     
-    # Store refresh token in session
+    # Store the refresh token's hash in the session, never the token itself
     session = Session.create_session(
         user_id=user.id,
-        refresh_token=refresh_token,
+        refresh_token=hash_secret(refresh_token),
         expires_days=settings.jwt_refresh_token_expire_days,
         ip_address=request.client.host if request.client else None,
         user_agent=request.headers.get("user-agent"),
@@ -147,10 +148,11 @@ async def refresh_token(
             detail="Invalid or expired refresh token",
         )
     
-    # Find session
+    # Find session (by token hash; sessions created before tokens were hashed
+    # still hold the raw token until they expire)
     result = await db.execute(
         select(Session)
-        .where(Session.refresh_token == data.refresh_token)
+        .where(Session.refresh_token.in_([hash_secret(data.refresh_token), data.refresh_token]))
         .where(Session.is_revoked == False)
         .where(Session.expires_at > datetime.utcnow())
     )
@@ -191,7 +193,9 @@ async def logout(
     """Logout and revoke refresh token."""
     # Find and revoke session
     result = await db.execute(
-        select(Session).where(Session.refresh_token == data.refresh_token)
+        select(Session).where(
+            Session.refresh_token.in_([hash_secret(data.refresh_token), data.refresh_token])
+        )
     )
     session = result.scalar_one_or_none()
     
@@ -12,6 +12,7 @@ from app.models.job import Job
 from app.models.user import User
 from app.schemas.job import JobListResponse, JobResponse
 from app.utils.deps import get_current_active_user
+from app.utils.job_progress import job_progress
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -67,7 +68,16 @@ async def get_job(
             detail="Job not found",
         )
     
-    return JobResponse.model_validate(job)
+    response = JobResponse.model_validate(job)
+    
+    # Running jobs publish step-by-step progress to Redis, not the DB
+    if job.status == "processing":
+        live = await job_progress.get(job.id)
+        if live:
+            response.current_step = live["step"]
+            response.progress = live["progress"]
+    
+    return response
 
 
 @router.post("/{job_id}/cancel", response_model=JobResponse)
@@ -7,7 +7,7 @@ import httpx
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, status
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
@@ -15,6 +15,7 @@ from app.models.avatar import Avatar
 from app.models.job import Job
 from app.models.user import User
 from app.utils.deps import get_current_active_user, RequireCredits
+from app.utils.user_cache import user_cache
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -154,8 +155,9 @@ async def stop_live_session(
             "credits_used": credits_used,
         }
     
-    # Deduct credits
-    user.credits = max(0, user.credits - credits_used)
+    # Deduct credits (evaluated in SQL so a cached user can't overwrite the balance)
+    user.credits = func.greatest(User.credits - credits_used, 0)
+    user_cache.invalidate_after_commit(db, user.id)
     
     # Remove session
     del active_sessions[session_id]
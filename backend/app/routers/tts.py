@@ -19,6 +19,7 @@ from app.schemas.voice import (
     VoiceResponse,
     VoiceUpdate,
 )
+from app.utils.credits import CreditManager
 from app.utils.deps import RequireCredits, get_current_active_user
 
 router = APIRouter()
@@ -103,7 +104,7 @@ async def create_voice(
         name=data.name,
         description=data.description,
         language=data.language,
-        gender=data.gender,
+        gender=data.gender.value if data.gender else None,
         config=data.config.model_dump() if data.config else None,
         is_default=data.is_default,
     )
@@ -181,7 +182,7 @@ async def update_voice(
     if data.language is not None:
         voice.language = data.language
     if data.gender is not None:
-        voice.gender = data.gender
+        voice.gender = data.gender.value
     if data.config is not None:
         voice.config = data.config.model_dump()
     
@@ -407,8 +408,13 @@ async def generate_tts(
             detail="TTS generation timed out. Try with shorter text.",
         )
     
-    # Deduct credits
-    user.credits -= credits_needed
+    # Deduct credits in one guarded UPDATE: the balance check above may have
+    # seen a cached user, and concurrent requests must not overdraw
+    if not await CreditManager(db).deduct_credits(user.id, credits_needed, "tts_generation"):
+        raise HTTPException(
+            status_code=status.HTTP_402_PAYMENT_REQUIRED,
+            detail=f"Insufficient credits. Need {credits_needed}",
+        )
     
     return TTSResponse(
         audio_url=audio_url,
@@ -13,7 +13,8 @@ from app.models.user import User
 from app.schemas.job import CreditsHistoryListResponse, CreditsHistoryResponse
 from app.schemas.user import PasswordChange, UserResponse, UserUpdate
 from app.utils.deps import get_current_active_user
-from app.utils.security import get_password_hash, verify_password
+from app.utils.security import aget_password_hash, averify_password
+from app.utils.user_cache import user_cache
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -49,6 +50,7 @@ async def update_current_user(
         user.email = data.email
         user.is_verified = False  # Require re-verification
     
+    user_cache.invalidate_after_commit(db, user.id)
     logger.info("User profile updated", user_id=str(user.id))
     return UserResponse.model_validate(user)
 
@@ -60,13 +62,16 @@ async def change_password(
     db: AsyncSession = Depends(get_db),
 ) -> None:
     """Change current user's password."""
-    if not verify_password(data.current_password, user.password_hash):
+    # The hash isn't part of the cached user snapshot
+    password_hash = await db.scalar(select(User.password_hash).where(User.id == user.id))
+    if not await averify_password(data.current_password, password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Current password is incorrect",
         )
     
-    user.password_hash = get_password_hash(data.new_password)
+    user.password_hash = await aget_password_hash(data.new_password)
+    user_cache.invalidate_after_commit(db, user.id)
     logger.info("User password changed", user_id=str(user.id))
 
 
@@ -109,5 +114,6 @@ async def delete_current_user(
     """Delete current user's account."""
     # Soft delete - just deactivate
     user.is_active = False
+    user_cache.invalidate_after_commit(db, user.id)
     logger.info("User account deleted", user_id=str(user.id))
 
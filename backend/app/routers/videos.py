@@ -1,10 +1,11 @@
 """Videos router."""
 from typing import List, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
@@ -15,6 +16,8 @@ from app.schemas.video import (
     VideoCreate,
     VideoGenerateRequest,
     VideoGenerateResponse,
+    VideoQuality,
+    VideoResolution,
     VideoResponse,
     VideoUpdate,
 )
@@ -22,9 +25,12 @@ from app.utils.credits import CreditManager, get_credit_manager
 from app.utils.deps import RequireCredits, get_current_active_user
 from app.workers.tasks import video_generation_task
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 logger = structlog.get_logger()
 
+# Plain columns for read-only endpoints; skips ORM identity map bookkeeping
+VIDEO_RESPONSE_COLUMNS = tuple(getattr(Video, name) for name in VideoResponse.model_fields)
+
 
 @router.post("", response_model=VideoResponse, status_code=status.HTTP_201_CREATED)
 async def create_video(
@@ -46,7 +52,7 @@ async def create_video(
     db.add(video)
     await db.flush()
     
-    logger.info("Video created", video_id=str(video.id), user_id=str(user.id))
+    logger.info("Video created", video_id=video.id)
     return VideoResponse.model_validate(video)
 
 
@@ -60,7 +66,7 @@ async def list_videos(
     db: AsyncSession = Depends(get_db),
 ) -> List[VideoResponse]:
     """List user's videos."""
-    query = select(Video).where(Video.user_id == user.id)
+    query = select(*VIDEO_RESPONSE_COLUMNS).where(Video.user_id == user.id)
     
     if status:
         query = query.where(Video.status == status)
@@ -70,9 +76,8 @@ async def list_videos(
     query = query.order_by(Video.created_at.desc()).limit(limit).offset(offset)
     
     result = await db.execute(query)
-    videos = result.scalars().all()
     
-    return [VideoResponse.model_validate(v) for v in videos]
+    return [VideoResponse.model_construct(**row) for row in result.mappings()]
 
 
 @router.get("/{video_id}", response_model=VideoResponse)
@@ -83,17 +88,19 @@ async def get_video(
 ) -> VideoResponse:
     """Get a specific video."""
     result = await db.execute(
-        select(Video).where(Video.id == video_id, Video.user_id == user.id)
+        select(*VIDEO_RESPONSE_COLUMNS).where(
+            Video.id == video_id, Video.user_id == user.id
+        )
     )
-    video = result.scalar_one_or_none()
+    row = result.mappings().first()
     
-    if not video:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Video not found",
         )
     
-    return VideoResponse.model_validate(video)
+    return VideoResponse.model_construct(**row)
 
 
 @router.patch("/{video_id}", response_model=VideoResponse)
@@ -132,7 +139,7 @@ async def update_video(
     if data.avatar_id is not None:
         video.avatar_id = data.avatar_id
     
-    logger.info("Video updated", video_id=str(video.id))
+    logger.info("Video updated", video_id=video.id)
     return VideoResponse.model_validate(video)
 
 
@@ -155,7 +162,7 @@ async def delete_video(
         )
     
     await db.delete(video)
-    logger.info("Video deleted", video_id=str(video_id))
+    logger.info("Video deleted", video_id=video_id)
 
 
 @router.post("/{video_id}/generate", response_model=VideoGenerateResponse)
@@ -190,23 +197,23 @@ async def generate_video(
         )
     
     
+    # Force lower settings for previews (but keep 1080p for stability with SadTalker)
+    resolution = VideoResolution.R1080 if data.preview else data.resolution
+    quality = VideoQuality.BALANCED if data.preview else data.quality
+    
     # Estimate credits using CreditManager
     estimated_credits = CreditManager.estimate_video_credits(
         script_length=len(video.script),
-        resolution=data.resolution,
+        resolution=resolution,
     )
     
     # Handle Preview Mode
     script_to_process = video.script
     if data.preview:
         # Truncate script for preview (first 50 words approx)
-        words = video.script.split()[:50]
+        words = video.script.split(None, 50)[:50]
         script_to_process = " ".join(words)
         
-        # Force lower settings for speed (but keep 1080p for stability with SadTalker)
-        data.resolution = "1080p"
-        data.quality = "balanced"
-        
         # Minimal credit cost or free
         estimated_credits = 0  # Free preview? Or small fee. 
         # Let's make it free for now to encourage usage.
@@ -230,17 +237,19 @@ async def generate_video(
             detail=f"Video too long for {user.plan} plan. Max: {plan_limits['max_video_length']}s",
         )
     
-    # Create job
-    job = Job(
+    # Create job (task ID is derived from the job ID so it is known up front)
+    job_id = uuid4()
+    job_insert = insert(Job).values(
+        id=job_id,
         user_id=user.id,
         type="video_generation",
         status="queued",
         input_data={
-            "video_id": str(video.id),
-            "quality": data.quality,
-            "resolution": data.resolution,
+            "video_id": video.id,
+            "quality": quality,
+            "resolution": resolution,
             # Prioritize runtime avatar selection, fallback to video record
-            "avatar_id": data.avatar_id if data.avatar_id else (str(video.avatar_id) if video.avatar_id else None),
+            "avatar_id": data.avatar_id or video.avatar_id,
             "script": script_to_process if data.preview else None,
             "preview": data.preview,
             # Avatar settings
@@ -251,31 +260,33 @@ async def generate_video(
             "voice_id": data.voice_id,
         },
         credits_estimated=estimated_credits,
+        celery_task_id=str(job_id),
     )
-    db.add(job)
-    await db.flush()
-    
-    # Update video with settings (ONLY if not preview, or update status is fine?)
-    # If preview, we shouldn't change the video main resolution/status permanently?
-    # Actually, preview is separate.
-    # But video_generation_task requires video status to be processing?
-    # No, it just updates it.
     
-    if not data.preview:
-        video.status = "queued"
-        video.resolution = data.resolution
+    if data.preview:
+        # Previews leave the video record untouched
+        await db.execute(job_insert)
+    else:
+        # Insert the job and queue the video in a single statement
+        await db.execute(
+            update(Video)
+            .where(Video.id == video.id)
+            .values(status="queued", resolution=resolution.value)
+            .add_cte(job_insert.cte("new_job"))
+            .execution_options(synchronize_session=False)
+        )
     
     await db.commit()
     
     # Queue Celery task for video generation
     try:
-        task = video_generation_task.delay(str(job.id))
-        job.celery_task_id = task.id
-        await db.commit()
+        task = video_generation_task.apply_async(
+            args=[str(job_id)], task_id=str(job_id)
+        )
         logger.info(
             "Video generation task queued",
-            video_id=str(video.id),
-            job_id=str(job.id),
+            video_id=video.id,
+            job_id=job_id,
             task_id=task.id,
             preview=data.preview,
         )
@@ -285,7 +296,7 @@ async def generate_video(
     
     return VideoGenerateResponse(
         video_id=video.id,
-        job_id=job.id,
+        job_id=job_id,
         status="queued",
         estimated_time=int(estimated_duration * 2),  # Processing time estimate
         credits_estimated=estimated_credits,
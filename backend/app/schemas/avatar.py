@@ -23,20 +23,51 @@ class AvatarGender(str, Enum):
     NEUTRAL = "neutral"
 
 
+class AvatarAgeRange(str, Enum):
+    """Avatar age ranges."""
+
+    YOUNG = "young"
+    ADULT = "adult"
+    SENIOR = "senior"
+
+
+class BackgroundType(str, Enum):
+    """Background fill types."""
+
+    SOLID = "solid"
+    GRADIENT = "gradient"
+    IMAGE = "image"
+    VIDEO = "video"
+    TRANSPARENT = "transparent"
+
+
+class LipSyncModel(str, Enum):
+    """Lip sync models."""
+
+    WAV2LIP = "wav2lip"
+    SADTALKER = "sadtalker"
+
+
+class LipSyncQuality(str, Enum):
+    """Lip sync quality presets."""
+
+    FAST = "fast"
+    BALANCED = "balanced"
+    HIGH = "high"
+
+
 class BackgroundConfig(BaseModel):
     """Background configuration."""
 
-    type: str = Field(
-        default="solid", pattern="^(solid|gradient|image|video|transparent)$"
-    )
+    type: BackgroundType = BackgroundType.SOLID
     value: str = "#FFFFFF"
 
 
 class LipSyncConfig(BaseModel):
     """Lip sync configuration."""
 
-    model: str = Field(default="wav2lip", pattern="^(wav2lip|sadtalker)$")
-    quality: str = Field(default="balanced", pattern="^(fast|balanced|high)$")
+    model: LipSyncModel = LipSyncModel.WAV2LIP
+    quality: LipSyncQuality = LipSyncQuality.BALANCED
 
 
 class AvatarConfig(BaseModel):
@@ -44,7 +75,7 @@ class AvatarConfig(BaseModel):
 
     style: AvatarStyle = AvatarStyle.REALISTIC
     gender: AvatarGender = AvatarGender.NEUTRAL
-    age_range: str = Field(default="adult", pattern="^(young|adult|senior)$")
+    age_range: AvatarAgeRange = AvatarAgeRange.ADULT
     background: BackgroundConfig = BackgroundConfig()
     expressions: Dict[str, Any] = {
         "default": "neutral",
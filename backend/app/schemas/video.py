@@ -28,6 +28,32 @@ class VideoStatus(str, Enum):
     FAILED = "failed"
 
 
+class VideoQuality(str, Enum):
+    """Video generation quality presets."""
+
+    FAST = "fast"
+    BALANCED = "balanced"
+    HIGH = "high"
+
+
+class VideoResolution(str, Enum):
+    """Video output resolutions."""
+
+    R720 = "720p"
+    R1080 = "1080p"
+    R4K = "4k"
+
+
+class VideoEmotion(str, Enum):
+    """Avatar emotion overrides for video generation."""
+
+    NEUTRAL = "neutral"
+    HAPPY = "happy"
+    SAD = "sad"
+    ANGRY = "angry"
+    SURPRISED = "surprised"
+
+
 class VideoCreate(BaseModel):
     """Video creation schema."""
 
@@ -81,12 +107,12 @@ class VideoResponse(BaseModel):
 class VideoGenerateRequest(BaseModel):
     """Request to start video generation."""
 
-    quality: str = Field(default="balanced", pattern="^(fast|balanced|high)$")
-    resolution: str = Field(default="1080p", pattern="^(720p|1080p|4k)$")
+    quality: VideoQuality = VideoQuality.BALANCED
+    resolution: VideoResolution = VideoResolution.R1080
     preview: bool = False
     
     # Avatar settings (SadTalker)
-    emotion: Optional[str] = Field(default=None, pattern="^(neutral|happy|sad|angry|surprised)$")
+    emotion: Optional[VideoEmotion] = None
     expression_scale: Optional[float] = Field(default=1.0, ge=0.0, le=2.0)
     head_pose_scale: Optional[float] = Field(default=1.0, ge=0.0, le=2.0)
     use_sadtalker: bool = True  # False = fallback to Wav2Lip
@@ -25,6 +25,14 @@ class VoiceEmotion(str, Enum):
     EXCITED = "excited"
 
 
+class VoiceGender(str, Enum):
+    """Voice gender options."""
+
+    MALE = "male"
+    FEMALE = "female"
+    NEUTRAL = "neutral"
+
+
 class VoiceConfig(BaseModel):
     """Voice configuration."""
 
@@ -41,7 +49,7 @@ class VoiceCreate(BaseModel):
     name: str = Field(..., min_length=1, max_length=255)
     description: Optional[str] = None
     language: str = Field(default="en", max_length=10)
-    gender: Optional[str] = Field(None, pattern="^(male|female|neutral)$")
+    gender: Optional[VoiceGender] = None
     config: Optional[VoiceConfig] = None
     is_default: bool = False
 
@@ -52,7 +60,7 @@ class VoiceUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = None
     language: Optional[str] = Field(None, max_length=10)
-    gender: Optional[str] = Field(None, pattern="^(male|female|neutral)$")
+    gender: Optional[VoiceGender] = None
     config: Optional[VoiceConfig] = None
     is_default: Optional[bool] = None
 
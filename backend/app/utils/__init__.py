@@ -1,9 +1,12 @@
 """Utility modules for NEURA."""
 from app.utils.logging import setup_logging
 from app.utils.security import (
+    aget_password_hash,
+    averify_password,
     create_access_token,
     create_refresh_token,
     get_password_hash,
+    hash_secret,
     verify_password,
     verify_token,
 )
@@ -12,6 +15,9 @@ __all__ = [
     "setup_logging",
     "get_password_hash",
     "verify_password",
+    "aget_password_hash",
+    "averify_password",
+    "hash_secret",
     "create_access_token",
     "create_refresh_token",
     "verify_token",
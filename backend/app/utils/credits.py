@@ -1,13 +1,15 @@
 """Credit management utilities."""
 from datetime import datetime
+from functools import cache, lru_cache
 from typing import Optional
 from uuid import UUID
 
 import structlog
-from sqlalchemy import select, update
+from sqlalchemy import text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
+from app.utils.user_cache import user_cache
 
 logger = structlog.get_logger()
 
@@ -68,6 +70,42 @@ PLAN_LIMITS = {
 }
 
 
+# Balance lookup as a plain textual statement (no ORM column mapping); the
+# asyncpg dialect keeps it in its per-connection prepared statement cache
+USER_CREDITS_QUERY = text("SELECT credits FROM users WHERE id = :user_id")
+
+# Script characters per video credit (~15 chars per second of speech)
+VIDEO_CHARS_PER_CREDIT = 15 * 60 // CREDIT_COSTS["video_per_minute"]
+
+# Resolution multipliers as integer numerators over _RESOLUTION_DEN
+# (0.5 / 1.0 / 2.0), so estimates stay in exact integer arithmetic
+_RESOLUTION_DEN = 2
+_RESOLUTION_NUM = {
+    resolution: int(CREDIT_COSTS[f"video_{resolution}_multiplier"] * _RESOLUTION_DEN)
+    for resolution in ("720p", "1080p", "4k")
+}
+
+
+@lru_cache(maxsize=1024)
+def _estimate_video_credits(base_credits: int, resolution: str) -> int:
+    """Apply the minimum charge and resolution multiplier to base credits."""
+    base_credits = max(base_credits, CREDIT_COSTS["video_minimum"])
+    numerator = _RESOLUTION_NUM.get(resolution, _RESOLUTION_DEN)
+    return base_credits * numerator // _RESOLUTION_DEN
+
+
+@cache
+def _plan_credits(plan: str) -> int:
+    """Monthly credit allocation for a plan, falling back to free."""
+    return PLAN_CREDITS.get(plan, PLAN_CREDITS["free"])
+
+
+@cache
+def _plan_limits(plan: str) -> dict:
+    """Limits for a plan, falling back to free."""
+    return PLAN_LIMITS.get(plan, PLAN_LIMITS["free"])
+
+
 class CreditManager:
     """Manager for user credits and billing."""
     
@@ -76,14 +114,17 @@ class CreditManager:
     
     async def get_user_credits(self, user_id: UUID) -> int:
         """Get user's current credit balance."""
-        result = await self.db.execute(
-            select(User.credits).where(User.id == user_id)
-        )
-        credits = result.scalar_one_or_none()
+        result = await self.db.execute(USER_CREDITS_QUERY, {"user_id": user_id})
+        credits = result.scalar()
         return credits or 0
     
     async def has_credits(self, user_id: UUID, amount: int) -> bool:
-        """Check if user has enough credits."""
+        """
+        Check if user has enough credits.
+        
+        Deprecated for check-then-spend flows: use try_deduct, which checks
+        and deducts in a single round-trip.
+        """
         credits = await self.get_user_credits(user_id)
         return credits >= amount
     
@@ -106,6 +147,22 @@ class CreditManager:
         Returns:
             True if successful, False if insufficient credits
         """
+        success, _ = await self.try_deduct(user_id, amount, reason, reference_id)
+        return success
+    
+    async def try_deduct(
+        self,
+        user_id: UUID,
+        amount: int,
+        reason: str,
+        reference_id: Optional[str] = None,
+    ) -> tuple[bool, Optional[int]]:
+        """
+        Atomically check and deduct credits in one statement.
+        
+        Returns:
+            Tuple of (success, new_balance); new_balance is None on failure
+        """
         # Atomic update with check
         result = await self.db.execute(
             update(User)
@@ -122,8 +179,9 @@ class CreditManager:
                 user_id=str(user_id),
                 amount=amount,
             )
-            return False
+            return False, None
         
+        user_cache.invalidate_after_commit(self.db, user_id)
         logger.info(
             "Credits deducted",
             user_id=str(user_id),
@@ -133,7 +191,7 @@ class CreditManager:
             reference_id=reference_id,
         )
         
-        return True
+        return True, new_balance
     
     async def add_credits(
         self,
@@ -141,10 +199,14 @@ class CreditManager:
         amount: int,
         reason: str,
         reference_id: Optional[str] = None,
+        operation: str = "add",
     ) -> int:
         """
         Add credits to user account.
         
+        Args:
+            operation: Label for the log record (e.g. "add", "refund")
+        
         Returns:
             New credit balance
         """
@@ -156,6 +218,7 @@ class CreditManager:
         )
         
         new_balance = result.scalar_one_or_none()
+        user_cache.invalidate_after_commit(self.db, user_id)
         
         logger.info(
             "Credits added",
@@ -164,6 +227,7 @@ class CreditManager:
             new_balance=new_balance,
             reason=reason,
             reference_id=reference_id,
+            operation=operation,
         )
         
         return new_balance or 0
@@ -175,14 +239,10 @@ class CreditManager:
         reason: str,
         reference_id: Optional[str] = None,
     ) -> int:
-        """Refund credits (alias for add_credits with logging)."""
-        logger.info(
-            "Processing credit refund",
-            user_id=str(user_id),
-            amount=amount,
-            reason=reason,
+        """Refund credits (alias for add_credits, logged as a refund)."""
+        return await self.add_credits(
+            user_id, amount, f"Refund: {reason}", reference_id, operation="refund"
         )
-        return await self.add_credits(user_id, amount, f"Refund: {reason}", reference_id)
     
     @staticmethod
     def estimate_video_credits(
@@ -199,23 +259,10 @@ class CreditManager:
         Returns:
             Estimated credits
         """
-        # Estimate duration (~15 chars per second of speech)
-        estimated_seconds = script_length / 15
-        estimated_minutes = estimated_seconds / 60
-        
-        # Base cost
-        base_credits = int(estimated_minutes * CREDIT_COSTS["video_per_minute"])
-        base_credits = max(base_credits, CREDIT_COSTS["video_minimum"])
-        
-        # Resolution multiplier
-        resolution_multipliers = {
-            "720p": CREDIT_COSTS["video_720p_multiplier"],
-            "1080p": CREDIT_COSTS["video_1080p_multiplier"],
-            "4k": CREDIT_COSTS["video_4k_multiplier"],
-        }
-        multiplier = resolution_multipliers.get(resolution, 1.0)
-        
-        return int(base_credits * multiplier)
+        # Key the cache on whole credits rather than raw character counts
+        return _estimate_video_credits(
+            script_length // VIDEO_CHARS_PER_CREDIT, resolution
+        )
     
     @staticmethod
     def estimate_tts_credits(text_length: int) -> int:
@@ -230,12 +277,12 @@ class CreditManager:
     @staticmethod
     def get_plan_credits(plan: str) -> int:
         """Get monthly credit allocation for a plan."""
-        return PLAN_CREDITS.get(plan, PLAN_CREDITS["free"])
+        return _plan_credits(plan)
     
     @staticmethod
     def get_plan_limits(plan: str) -> dict:
         """Get limits for a plan."""
-        return PLAN_LIMITS.get(plan, PLAN_LIMITS["free"])
+        return _plan_limits(plan)
     
     @staticmethod
     def check_plan_limit(
@@ -249,8 +296,7 @@ class CreditManager:
         Returns:
             Tuple of (is_allowed, error_message)
         """
-        limits = PLAN_LIMITS.get(plan, PLAN_LIMITS["free"])
-        limit = limits.get(limit_type)
+        limit = _plan_limits(plan).get(limit_type)
         
         if limit is None:
             return True, ""
@@ -3,7 +3,7 @@ from typing import Optional
 from uuid import UUID
 
 import structlog
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.models.user import User
 from app.utils.security import verify_token
+from app.utils.user_cache import user_cache
 
 logger = structlog.get_logger()
 
@@ -19,6 +20,7 @@ security = HTTPBearer(auto_error=False)
 
 
 async def get_current_user_optional(
+    request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: AsyncSession = Depends(get_db),
 ) -> Optional[User]:
@@ -26,10 +28,11 @@ async def get_current_user_optional(
     if not credentials:
         return None
     
-    return await _get_user_from_token(credentials.credentials, db)
+    return await _get_user_from_token(credentials.credentials, db, request)
 
 
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db),
 ) -> User:
@@ -41,7 +44,7 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = await _get_user_from_token(credentials.credentials, db)
+    user = await _get_user_from_token(credentials.credentials, db, request)
     
     if not user:
         raise HTTPException(
@@ -50,6 +53,7 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    structlog.contextvars.bind_contextvars(user_id=str(user.id))
     return user
 
 
@@ -77,9 +81,18 @@ async def get_current_verified_user(
     return user
 
 
-async def _get_user_from_token(token: str, db: AsyncSession) -> Optional[User]:
+async def _get_user_from_token(
+    token: str,
+    db: AsyncSession,
+    request: Optional[Request] = None,
+) -> Optional[User]:
     """Extract and validate user from JWT token."""
-    payload = verify_token(token, token_type="access")
+    # Reuse the payload AuthMiddleware already verified for this request
+    state = request.state if request is not None else None
+    if state is not None and hasattr(state, "token_payload"):
+        payload = state.token_payload
+    else:
+        payload = verify_token(token, token_type="access")
     
     if not payload:
         return None
@@ -93,8 +106,15 @@ async def _get_user_from_token(token: str, db: AsyncSession) -> Optional[User]:
     except ValueError:
         return None
     
+    user = await user_cache.get(user_uuid, db)
+    if user is not None:
+        return user
+    
     result = await db.execute(select(User).where(User.id == user_uuid))
-    return result.scalar_one_or_none()
+    user = result.scalar_one_or_none()
+    if user is not None:
+        await user_cache.set(user)
+    return user
 
 
 class RequireCredits:
@@ -119,12 +139,15 @@ class RequirePlan:
     
     def __init__(self, min_plan: str):
         self.min_plan = min_plan
+        self._required_level = self.PLAN_LEVELS.get(min_plan, 0)
+        # Plans that satisfy min_plan; None means every plan (including unknown ones) does
+        self._allowed = None if self._required_level == 0 else frozenset(
+            plan for plan, level in self.PLAN_LEVELS.items()
+            if level >= self._required_level
+        )
     
     async def __call__(self, user: User = Depends(get_current_active_user)) -> User:
-        user_level = self.PLAN_LEVELS.get(user.plan, 0)
-        required_level = self.PLAN_LEVELS.get(self.min_plan, 0)
-        
-        if user_level < required_level:
+        if self._allowed is not None and user.plan not in self._allowed:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Plan '{self.min_plan}' or higher required",
@@ -4,10 +4,19 @@ Emotion detection utilities for avatar generation.
 Analyzes text scripts to detect emotional tone and map to avatar expressions.
 """
 
-from typing import Optional, Dict
+import asyncio
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import nullcontext
+from functools import lru_cache
+from typing import Callable, List, Optional, Dict, Tuple
 import re
 import structlog
 
+from app.config import settings
+
 logger = structlog.get_logger()
 
 # Emotion keywords mapping
@@ -31,6 +40,66 @@ EMOTION_KEYWORDS = {
     "neutral": []
 }
 
+# One word-boundary alternation per emotion, compiled on first use
+_EMOTION_PATTERNS: Optional[Dict[str, "re.Pattern[str]"]] = None
+
+
+def _compile_patterns() -> Dict[str, "re.Pattern[str]"]:
+    """
+    Compile the keyword patterns and load the Numba scorer (deferred so
+    importers that never detect pay nothing).
+    """
+    global _EMOTION_PATTERNS, _numba_scorer
+    _numba_scorer = _load_numba_scorer()
+    _EMOTION_PATTERNS = {
+        emotion: re.compile(r"\b(?:" + "|".join(re.escape(k) for k in keywords) + r")\b")
+        for emotion, keywords in EMOTION_KEYWORDS.items()
+        if keywords
+    }
+    return _EMOTION_PATTERNS
+
+# Texts at least this long use the Numba keyword kernel when available
+NUMBA_MIN_TEXT_LENGTH = 4096
+
+# Emotion order for the Numba kernel's score array
+_SCORED_EMOTIONS = ("happy", "sad", "angry", "surprised")
+
+# Keyword scorer for long ASCII text; set by _compile_patterns, stays None
+# when numba isn't installed
+_numba_scorer: Optional[Callable[[str], Dict[str, int]]] = None
+
+
+def _load_numba_scorer() -> Optional[Callable[[str], Dict[str, int]]]:
+    """Build the Numba keyword scorer, or None to use the regex path only."""
+    try:
+        from app.utils.emotion_kernel import build_keyword_scorer
+    except ImportError:
+        return None
+    return build_keyword_scorer(EMOTION_KEYWORDS, _SCORED_EMOTIONS)
+
+
+# Hugging Face model used when no ONNX export is configured
+EMOTION_MODEL_ID = "j-hartmann/emotion-english-distilroberta-base"
+
+# Map ML model labels to our emotion set
+ML_EMOTION_MAP = {
+    "joy": "happy",
+    "sadness": "sad",
+    "anger": "angry",
+    "fear": "neutral",
+    "surprise": "surprised",
+    "disgust": "neutral",
+    "neutral": "neutral"
+}
+
+# Memoized detections keyed by (text digest, use_ml), plus a single
+# last-seen slot since consecutive calls often repeat the same script.
+# Guarded by a lock: workers may run with --pool=threads
+EMOTION_CACHE_SIZE = 4096
+_emotion_cache: "OrderedDict[Tuple[bytes, bool], str]" = OrderedDict()
+_last_result: Optional[Tuple[Tuple[bytes, bool], str]] = None
+_emotion_cache_lock = threading.Lock()
+
 # Punctuation-based emotion hints
 PUNCTUATION_EMOTIONS = {
     "!": "happy",  # Exclamation suggests excitement
@@ -52,41 +121,113 @@ def detect_emotion_from_text(text: str, use_ml: bool = False) -> str:
     if not text or len(text.strip()) < 10:
         return "neutral"
     
+    key = _cache_key(text, use_ml)
+    emotion = _cache_get(key)
+    if emotion is not None:
+        return emotion
+    
     # Try ML-based detection if enabled
     if use_ml:
         try:
-            return _detect_emotion_ml(text)
+            emotion = _detect_emotion_ml(text)
         except Exception as e:
             logger.warning("ML emotion detection failed, using keyword fallback", error=str(e))
     
     # Fallback to keyword-based detection
-    return _detect_emotion_keywords(text)
+    if emotion is None:
+        emotion = _detect_emotion_keywords(text)
+    
+    _cache_put(key, emotion)
+    return emotion
+
+
+async def detect_emotion_from_text_async(text: str, use_ml: bool = False) -> str:
+    """
+    Async variant of detect_emotion_from_text.
+    
+    In ML mode, concurrent callers on the same event loop are classified
+    together in micro-batches (see EmotionBatcher).
+    """
+    if not text or len(text.strip()) < 10:
+        return "neutral"
+    
+    key = _cache_key(text, use_ml)
+    emotion = _cache_get(key)
+    if emotion is not None:
+        return emotion
+    
+    if use_ml:
+        try:
+            emotion = await _get_batcher().submit(text)
+        except ImportError:
+            logger.warning("transformers not installed, using keyword detection")
+        except Exception as e:
+            logger.warning("ML emotion detection failed, using keyword fallback", error=str(e))
+    
+    if emotion is None:
+        emotion = _detect_emotion_keywords(text)
+    
+    _cache_put(key, emotion)
+    return emotion
+
+
+def _cache_key(text: str, use_ml: bool) -> Tuple[bytes, bool]:
+    """Cache key from a digest of the stripped text (avoids holding long scripts)."""
+    return hashlib.blake2b(text.strip().encode(), digest_size=16).digest(), use_ml
+
+
+def _cache_get(key: Tuple[bytes, bool]) -> Optional[str]:
+    """Look up a cached emotion, checking the last-seen slot first."""
+    global _last_result
+    
+    with _emotion_cache_lock:
+        last = _last_result
+        if last is not None and last[0] == key:
+            return last[1]
+        
+        emotion = _emotion_cache.get(key)
+        if emotion is not None:
+            _emotion_cache.move_to_end(key)
+            _last_result = (key, emotion)
+        return emotion
+
+
+def _cache_put(key: Tuple[bytes, bool], emotion: str) -> None:
+    """Store a detected emotion, evicting the least recently used entry."""
+    global _last_result
+    
+    with _emotion_cache_lock:
+        _emotion_cache[key] = emotion
+        if len(_emotion_cache) > EMOTION_CACHE_SIZE:
+            _emotion_cache.popitem(last=False)
+        _last_result = (key, emotion)
 
 
 def _detect_emotion_keywords(text: str) -> str:
     """Detect emotion using keyword matching."""
-    text_lower = text.lower()
+    patterns = _EMOTION_PATTERNS
+    if patterns is None:
+        patterns = _compile_patterns()
     
     # Count emotion keywords
-    emotion_scores: Dict[str, int] = {
-        "happy": 0,
-        "sad": 0,
-        "angry": 0,
-        "surprised": 0
-    }
-    
-    for emotion, keywords in EMOTION_KEYWORDS.items():
-        if emotion == "neutral":
-            continue
-        for keyword in keywords:
-            # Use word boundaries to avoid partial matches
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            matches = len(re.findall(pattern, text_lower))
-            emotion_scores[emotion] += matches
+    scorer = _numba_scorer
+    if scorer is not None and len(text) >= NUMBA_MIN_TEXT_LENGTH and text.isascii():
+        emotion_scores = scorer(text)
+    else:
+        text_lower = text.lower()
+        emotion_scores: Dict[str, int] = {
+            "happy": 0,
+            "sad": 0,
+            "angry": 0,
+            "surprised": 0
+        }
+        
+        for emotion, pattern in patterns.items():
+            emotion_scores[emotion] += len(pattern.findall(text_lower))
     
-    # Check punctuation
-    exclamation_count = text.count("!")
-    question_count = text.count("?")
+    # Check punctuation (skip the counting pass when the mark is absent)
+    exclamation_count = text.count("!") if "!" in text else 0
+    question_count = text.count("?") if "?" in text else 0
     
     if exclamation_count > 2:
         emotion_scores["happy"] += exclamation_count // 2
@@ -106,6 +247,59 @@ def _detect_emotion_keywords(text: str) -> str:
     return "neutral"
 
 
+def _load_fast_tokenizer(model_id: str):
+    """Load the Rust-backed tokenizer for a model, refusing the slow Python one."""
+    from transformers import AutoTokenizer
+    
+    tokenizer = AutoTokenizer.from_pretrained(model_id, use_fast=True)
+    if not tokenizer.is_fast:
+        raise RuntimeError(f"No fast tokenizer available for {model_id}")
+    return tokenizer
+
+
+@lru_cache(maxsize=1)
+def _get_ml_classifier():
+    """
+    Load the emotion classification pipeline once per process.
+    
+    If EMOTION_ONNX_MODEL_PATH points at a dynamically quantized (int8) ONNX
+    export, it is served through ONNX Runtime instead of FP32 PyTorch:
+    
+        optimum-cli export onnx --model j-hartmann/emotion-english-distilroberta-base \
+            --task text-classification ./emotion-onnx
+        optimum-cli onnxruntime quantize --onnx_model ./emotion-onnx --avx512_vnni -o ./emotion-int8
+    
+    Requires: pip install optimum[onnxruntime]
+    
+    Both paths use the Rust-backed fast tokenizer (tokenizers crate), which
+    releases the GIL while encoding.
+    """
+    from transformers import AutoModelForSequenceClassification, pipeline
+    
+    onnx_path = settings.emotion_onnx_model_path
+    if onnx_path:
+        try:
+            from optimum.onnxruntime import ORTModelForSequenceClassification
+            
+            logger.info("Loading quantized emotion classification model...", path=onnx_path)
+            return pipeline(
+                "text-classification",
+                model=ORTModelForSequenceClassification.from_pretrained(onnx_path),
+                tokenizer=_load_fast_tokenizer(onnx_path),
+                top_k=1
+            )
+        except ImportError:
+            logger.warning("optimum[onnxruntime] not installed, using PyTorch emotion model")
+    
+    logger.info("Loading emotion classification model...")
+    return pipeline(
+        "text-classification",
+        model=AutoModelForSequenceClassification.from_pretrained(EMOTION_MODEL_ID),
+        tokenizer=_load_fast_tokenizer(EMOTION_MODEL_ID),
+        top_k=1
+    )
+
+
 def _detect_emotion_ml(text: str) -> str:
     """
     Detect emotion using ML model (transformers).
@@ -113,32 +307,12 @@ def _detect_emotion_ml(text: str) -> str:
     Requires: pip install transformers torch
     """
     try:
-        from transformers import pipeline
-        
-        # Use cached classifier if available
-        if not hasattr(_detect_emotion_ml, 'classifier'):
-            logger.info("Loading emotion classification model...")
-            _detect_emotion_ml.classifier = pipeline(
-                "text-classification",
-                model="j-hartmann/emotion-english-distilroberta-base",
-                top_k=1
-            )
+        classifier = _get_ml_classifier()
         
         # Classify (limit to first 512 chars for performance)
-        result = _detect_emotion_ml.classifier(text[:512])[0][0]
+        result = classifier(text[:512])[0][0]
         
-        # Map model labels to our emotion set
-        emotion_map = {
-            "joy": "happy",
-            "sadness": "sad",
-            "anger": "angry",
-            "fear": "neutral",
-            "surprise": "surprised",
-            "disgust": "neutral",
-            "neutral": "neutral"
-        }
-        
-        detected = emotion_map.get(result['label'].lower(), "neutral")
+        detected = ML_EMOTION_MAP.get(result['label'].lower(), "neutral")
         confidence = result['score']
         
         logger.info("Emotion detected (ML)",
@@ -156,6 +330,102 @@ def _detect_emotion_ml(text: str) -> str:
         return _detect_emotion_keywords(text)
 
 
+def _inference_mode():
+    """torch.inference_mode() when torch is available, else a no-op."""
+    try:
+        import torch
+    except ImportError:
+        return nullcontext()
+    return torch.inference_mode()
+
+
+def _classify_batch(texts: List[str]) -> List[str]:
+    """Classify a batch of texts with a single pipeline call."""
+    classifier = _get_ml_classifier()
+    
+    with _inference_mode():
+        results = classifier(texts, batch_size=len(texts))
+    
+    return [ML_EMOTION_MAP.get(r[0]['label'].lower(), "neutral") for r in results]
+
+
+class EmotionBatcher:
+    """
+    Micro-batcher for ML emotion classification.
+    
+    Texts submitted within max_wait_ms of each other (up to max_batch) are
+    classified in one forward pass instead of one call per text.
+    """
+    
+    def __init__(self, max_batch: int = 16, max_wait_ms: int = 20):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "asyncio.Queue[Tuple[str, asyncio.Future]]" = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+    
+    async def submit(self, text: str) -> str:
+        """Queue text for classification and wait for its emotion."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        
+        future = asyncio.get_running_loop().create_future()
+        # Limit to first 512 chars for performance
+        await self._queue.put((text[:512], future))
+        return await future
+    
+    async def _run(self) -> None:
+        """Drain the queue in batches and resolve callers' futures."""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            texts = [text for text, _ in batch]
+            try:
+                # Model inference is blocking; keep it off the event loop
+                emotions = await loop.run_in_executor(None, _classify_batch, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            logger.info("Emotion batch classified (ML)", batch_size=len(batch))
+            for (_, future), emotion in zip(batch, emotions):
+                if not future.done():
+                    future.set_result(emotion)
+
+
+# One batcher per event loop (threaded workers each run their own loop).
+# A batcher's worker task references its loop, so entries for closed loops
+# are pruned explicitly rather than left to the weak reference
+_batchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, EmotionBatcher]"
+_batchers = weakref.WeakKeyDictionary()
+_batchers_lock = threading.Lock()
+
+
+def _get_batcher() -> EmotionBatcher:
+    """Get the EmotionBatcher for the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _batchers_lock:
+        batcher = _batchers.get(loop)
+        if batcher is None:
+            for closed in [other for other in _batchers if other.is_closed()]:
+                del _batchers[closed]
+            batcher = _batchers[loop] = EmotionBatcher()
+    return batcher
+
+
 def get_emotion_parameters(
     emotion: str,
     expression_scale: Optional[float] = None,
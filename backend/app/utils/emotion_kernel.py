@@ -0,0 +1,92 @@
+"""
+Numba keyword-scoring kernel for emotion detection.
+
+Imported lazily by app.utils.emotion the first time keywords are scored, so
+importers that never detect emotions don't pay for numpy/numba. Raises
+ImportError when numba is not installed.
+"""
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+from numba import njit
+
+_FNV_OFFSET = 0xCBF29CE484222325
+_FNV_PRIME = 0x100000001B3
+_UINT64_MASK = 0xFFFFFFFFFFFFFFFF
+
+_NB_FNV_OFFSET = np.uint64(_FNV_OFFSET)
+_NB_FNV_PRIME = np.uint64(_FNV_PRIME)
+
+
+def _fnv1a(word: bytes) -> int:
+    """64-bit FNV-1a hash (must match the Numba kernel)."""
+    h = _FNV_OFFSET
+    for byte in word:
+        h = ((h ^ byte) * _FNV_PRIME) & _UINT64_MASK
+    return h
+
+
+@njit(cache=True)
+def _tally_word(h, kw_hashes, kw_emotions, scores):
+    idx = np.searchsorted(kw_hashes, h)
+    if idx < kw_hashes.size and kw_hashes[idx] == h:
+        scores[kw_emotions[idx]] += 1
+
+
+@njit(cache=True)
+def _score_keywords_kernel(buf, kw_hashes, kw_emotions, scores):
+    """
+    Tally keyword hits over lowercase-folded ASCII bytes.
+    
+    Words are maximal runs of [A-Za-z0-9_], matching the regex \\b
+    boundaries used by the pattern path for ASCII text.
+    """
+    h = _NB_FNV_OFFSET
+    in_word = False
+    for i in range(buf.size):
+        c = buf[i]
+        if 65 <= c <= 90:
+            c += 32
+        if (97 <= c <= 122) or (48 <= c <= 57) or c == 95:
+            if not in_word:
+                h = _NB_FNV_OFFSET
+                in_word = True
+            h = (h ^ np.uint64(c)) * _NB_FNV_PRIME
+        elif in_word:
+            _tally_word(h, kw_hashes, kw_emotions, scores)
+            in_word = False
+    if in_word:
+        _tally_word(h, kw_hashes, kw_emotions, scores)
+
+
+def build_keyword_scorer(
+    keywords: Dict[str, List[str]],
+    emotions: Sequence[str],
+) -> Callable[[str], Dict[str, int]]:
+    """
+    Build a scorer for ASCII text over the given keyword table.
+    
+    Args:
+        keywords: Emotion -> keyword list (emotions not in `emotions` are ignored)
+        emotions: Emotions to score, in result order
+    
+    Returns:
+        Function mapping text to {emotion: keyword hit count}
+    """
+    # Keyword hashes sorted for binary search, with parallel emotion indices
+    kw_pairs = sorted(
+        (_fnv1a(keyword.encode("ascii")), emotions.index(emotion))
+        for emotion, words in keywords.items()
+        if emotion in emotions
+        for keyword in words
+    )
+    kw_hashes = np.array([h for h, _ in kw_pairs], dtype=np.uint64)
+    kw_emotions = np.array([e for _, e in kw_pairs], dtype=np.int64)
+    
+    def score(text: str) -> Dict[str, int]:
+        buf = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+        scores = np.zeros(len(emotions), dtype=np.int64)
+        _score_keywords_kernel(buf, kw_hashes, kw_emotions, scores)
+        return {emotion: int(count) for emotion, count in zip(emotions, scores)}
+    
+    return score
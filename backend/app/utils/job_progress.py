@@ -0,0 +1,87 @@
+"""Redis-backed live progress for running jobs."""
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+import orjson
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger()
+
+# Seconds a progress entry outlives its last update
+JOB_PROGRESS_TTL = 3600
+
+
+class JobProgressStore:
+    """
+    Advisory progress (step + fraction) for jobs while they run.
+    
+    Workers publish every pipeline step here instead of committing each bump
+    to Postgres; the jobs API overlays it on the DB row for processing jobs,
+    and each update is also broadcast on the job's channel for live
+    subscribers. The final status and progress are still committed with the
+    job.
+    """
+    
+    def __init__(self, redis_url: Optional[str] = None, ttl: int = JOB_PROGRESS_TTL):
+        self.ttl = ttl
+        self._redis = None
+        self._redis_url = redis_url or settings.redis_url
+    
+    async def _get_redis(self):
+        """Get or create Redis connection."""
+        if self._redis is None:
+            try:
+                import redis.asyncio as redis
+                self._redis = redis.from_url(self._redis_url, decode_responses=True)
+            except Exception as e:
+                logger.warning("Redis not available for job progress", error=str(e))
+        return self._redis
+    
+    @staticmethod
+    def _key(job_id: UUID) -> str:
+        return f"job:{job_id}"
+    
+    async def publish(self, job_id: UUID, step: str, progress: float) -> None:
+        """Record the current step and progress of a job."""
+        redis = await self._get_redis()
+        if not redis:
+            return
+        
+        key = self._key(job_id)
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.hset(key, mapping={"step": step, "progress": progress})
+                pipe.expire(key, self.ttl)
+                pipe.publish(key, orjson.dumps({"step": step, "progress": progress}))
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("Job progress publish failed", job_id=str(job_id), error=str(e))
+    
+    async def get(self, job_id: UUID) -> Optional[Dict[str, Any]]:
+        """Get the latest published step and progress, or None."""
+        redis = await self._get_redis()
+        if not redis:
+            return None
+        
+        try:
+            data = await redis.hgetall(self._key(job_id))
+        except Exception as e:
+            logger.warning("Job progress read failed", job_id=str(job_id), error=str(e))
+            return None
+        
+        if not data:
+            return None
+        
+        return {"step": data.get("step"), "progress": float(data.get("progress", 0.0))}
+    
+    async def close(self) -> None:
+        """Close the Redis connection pool, if one was opened."""
+        redis, self._redis = self._redis, None
+        if redis is not None:
+            await redis.aclose()
+
+
+# Global store for the API process
+job_progress = JobProgressStore()
@@ -2,14 +2,32 @@
 import logging
 import sys
 from typing import Any, Dict
+from uuid import UUID
 
+import orjson
 import structlog
 
 from app.config import settings
 
 
+def _stringify_uuids(
+    logger: Any, method_name: str, event_dict: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Render UUID values as plain strings (only runs for emitted records)."""
+    for key, value in event_dict.items():
+        if isinstance(value, UUID):
+            event_dict[key] = str(value)
+    return event_dict
+
+
+def _orjson_dumps_str(obj: Any, **kwargs: Any) -> str:
+    """orjson serializer for text-only streams."""
+    return orjson.dumps(obj, **kwargs).decode("utf-8")
+
+
 def setup_logging() -> None:
     """Configure structured logging for the application."""
+    level = logging.DEBUG if settings.debug else logging.INFO
     
     # Configure structlog
     processors = [
@@ -19,20 +37,32 @@ def setup_logging() -> None:
         structlog.stdlib.PositionalArgumentsFormatter(),
         structlog.processors.StackInfoRenderer(),
         structlog.processors.UnicodeDecoder(),
+        _stringify_uuids,
     ]
     
     if settings.debug:
         # Development: colored console output
         processors.append(structlog.dev.ConsoleRenderer(colors=True))
+        logger_factory = structlog.PrintLoggerFactory()
     else:
-        # Production: JSON output
-        processors.append(structlog.processors.JSONRenderer())
+        # Production: JSON output, rendered straight to bytes and written to
+        # the process's real stdout (flushed per record) without re-encoding.
+        # sys.stdout itself may be replaced (Celery's LoggingProxy has no
+        # .buffer), so the byte stream is resolved from sys.__stdout__
+        stdout_bytes = getattr(sys.__stdout__, "buffer", None)
+        if stdout_bytes is not None:
+            processors.append(structlog.processors.JSONRenderer(serializer=orjson.dumps))
+            logger_factory = structlog.BytesLoggerFactory(file=stdout_bytes)
+        else:
+            processors.append(structlog.processors.JSONRenderer(serializer=_orjson_dumps_str))
+            logger_factory = structlog.PrintLoggerFactory(file=sys.stdout)
     
     structlog.configure(
         processors=processors,
-        wrapper_class=structlog.stdlib.BoundLogger,
+        # Calls below the level return before any processor runs
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
     
@@ -40,7 +70,7 @@ def setup_logging() -> None:
     logging.basicConfig(
         format="%(message)s",
         stream=sys.stdout,
-        level=logging.DEBUG if settings.debug else logging.INFO,
+        level=level,
     )
     
     # Silence noisy loggers
@@ -1,5 +1,10 @@
 """Monitoring and observability utilities."""
+import asyncio
+import atexit
 import os
+import queue
+import re
+import threading
 import time
 from contextlib import asynccontextmanager
 from functools import wraps
@@ -105,18 +110,27 @@ if PROMETHEUS_AVAILABLE:
     })
 
 
+# Path normalization patterns (IDs -> placeholders)
+_UUID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+_NUM_ID_RE = re.compile(r"/\d+(/|$)")
+_ANY_DIGIT_RE = re.compile(r"\d")
+
+
 class MetricsMiddleware:
     """FastAPI middleware for collecting request metrics."""
     
     def __init__(self, app):
         self.app = app
+        # Bound label children, so labels() runs once per series
+        self._count_cache: Dict[tuple, "Counter"] = {}
+        self._latency_cache: Dict[tuple, "Histogram"] = {}
     
     async def __call__(self, scope, receive, send):
         if scope["type"] != "http" or not PROMETHEUS_AVAILABLE:
             await self.app(scope, receive, send)
             return
         
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         # Capture response status
         status_code = 500
@@ -130,7 +144,7 @@ class MetricsMiddleware:
         try:
             await self.app(scope, receive, send_wrapper)
         finally:
-            duration = time.time() - start_time
+            duration = (time.perf_counter_ns() - start_ns) * 1e-9
             
             # Get path
             path = scope.get("path", "/")
@@ -140,30 +154,42 @@ class MetricsMiddleware:
             normalized_path = self._normalize_path(path)
             
             # Record metrics
-            REQUEST_COUNT.labels(
+            self._get_count(method, normalized_path, status_code).inc()
+            self._get_latency(method, normalized_path).observe(duration)
+    
+    def _get_count(self, method: str, endpoint: str, status_code: int):
+        """Get the request counter child for a (method, endpoint, status)."""
+        key = (method, endpoint, status_code)
+        counter = self._count_cache.get(key)
+        if counter is None:
+            counter = REQUEST_COUNT.labels(
                 method=method,
-                endpoint=normalized_path,
+                endpoint=endpoint,
                 status=str(status_code),
-            ).inc()
-            
-            REQUEST_LATENCY.labels(
-                method=method,
-                endpoint=normalized_path,
-            ).observe(duration)
+            )
+            self._count_cache[key] = counter
+        return counter
+    
+    def _get_latency(self, method: str, endpoint: str):
+        """Get the latency histogram child for a (method, endpoint)."""
+        key = (method, endpoint)
+        histogram = self._latency_cache.get(key)
+        if histogram is None:
+            histogram = REQUEST_LATENCY.labels(method=method, endpoint=endpoint)
+            self._latency_cache[key] = histogram
+        return histogram
     
     def _normalize_path(self, path: str) -> str:
         """Normalize path by replacing IDs with placeholders."""
-        import re
+        # Fast path: static routes (no digits) can't contain an ID
+        if not _ANY_DIGIT_RE.search(path):
+            return path
         
         # Replace UUIDs
-        path = re.sub(
-            r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}",
-            "{id}",
-            path,
-        )
+        path = _UUID_RE.sub("{id}", path)
         
         # Replace numeric IDs
-        path = re.sub(r"/\d+(/|$)", "/{id}\\1", path)
+        path = _NUM_ID_RE.sub("/{id}\\1", path)
         
         return path
 
@@ -286,6 +312,61 @@ def capture_message(message: str, level: str = "info", **context):
         pass
 
 
+# =====================
+# Background Metric Writer
+# =====================
+
+# Metric updates queued by request handlers and applied by a single writer
+# thread, keeping prometheus_client's locks off the request path
+_METRIC_QUEUE: "queue.SimpleQueue[Optional[Callable[[], None]]]" = queue.SimpleQueue()
+_metric_thread: Optional[threading.Thread] = None
+_metric_thread_lock = threading.Lock()
+
+
+def _drain_metrics() -> None:
+    """Apply queued metric updates until a None sentinel arrives."""
+    while True:
+        update = _METRIC_QUEUE.get()
+        if update is None:
+            return
+        try:
+            update()
+        except Exception as e:
+            logger.warning("Metric update failed", error=str(e))
+
+
+def _enqueue_metric(update: Callable[[], None]) -> None:
+    """Queue a metric update, starting the writer thread if needed."""
+    global _metric_thread
+    
+    # Checked on every call: forked workers inherit a dead thread object
+    if _metric_thread is None or not _metric_thread.is_alive():
+        with _metric_thread_lock:
+            if _metric_thread is None or not _metric_thread.is_alive():
+                _metric_thread = threading.Thread(
+                    target=_drain_metrics,
+                    name="metrics-writer",
+                    daemon=True,
+                )
+                _metric_thread.start()
+    
+    _METRIC_QUEUE.put(update)
+
+
+@atexit.register
+def flush_metrics(timeout: float = 5.0) -> None:
+    """Apply pending metric updates and stop the writer thread."""
+    global _metric_thread
+    
+    thread = _metric_thread
+    if thread is None or not thread.is_alive():
+        return
+    
+    _METRIC_QUEUE.put(None)
+    thread.join(timeout)
+    _metric_thread = None
+
+
 # =====================
 # Performance Tracking
 # =====================
@@ -295,15 +376,18 @@ def track_video_generation(resolution: str, status: str, duration: float):
     if not PROMETHEUS_AVAILABLE:
         return
     
-    VIDEO_GENERATION_COUNT.labels(
-        status=status,
-        resolution=resolution,
-    ).inc()
-    
-    if status == "completed":
-        VIDEO_GENERATION_DURATION.labels(
+    def update():
+        VIDEO_GENERATION_COUNT.labels(
+            status=status,
             resolution=resolution,
-        ).observe(duration)
+        ).inc()
+        
+        if status == "completed":
+            VIDEO_GENERATION_DURATION.labels(
+                resolution=resolution,
+            ).observe(duration)
+    
+    _enqueue_metric(update)
 
 
 def track_tts_request(voice: str, status: str, duration: float):
@@ -311,10 +395,13 @@ def track_tts_request(voice: str, status: str, duration: float):
     if not PROMETHEUS_AVAILABLE:
         return
     
-    TTS_REQUESTS.labels(voice=voice, status=status).inc()
+    def update():
+        TTS_REQUESTS.labels(voice=voice, status=status).inc()
+        
+        if status == "success":
+            TTS_DURATION.observe(duration)
     
-    if status == "success":
-        TTS_DURATION.observe(duration)
+    _enqueue_metric(update)
 
 
 def track_live_session(active: bool):
@@ -333,7 +420,7 @@ def track_live_message(message_type: str):
     if not PROMETHEUS_AVAILABLE:
         return
     
-    LIVE_SESSION_MESSAGES.labels(type=message_type).inc()
+    _enqueue_metric(lambda: LIVE_SESSION_MESSAGES.labels(type=message_type).inc())
 
 
 def track_credits_used(operation: str, amount: int):
@@ -365,15 +452,24 @@ def set_active_users(count: int):
 # =====================
 
 def timed(metric_name: str = None):
-    """Decorator to measure function execution time."""
+    """
+    Decorator to measure function execution time.
+    
+    Timings are only logged at debug level, so outside debug mode the
+    function is returned undecorated and costs nothing per call.
+    """
     def decorator(func: Callable):
+        # Same switch setup_logging uses for the DEBUG level
+        if not settings.debug:
+            return func
+        
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
-            start = time.time()
+            start_ns = time.perf_counter_ns()
             try:
                 return await func(*args, **kwargs)
             finally:
-                duration = time.time() - start
+                duration = (time.perf_counter_ns() - start_ns) * 1e-9
                 logger.debug(
                     "Function executed",
                     function=func.__name__,
@@ -382,18 +478,17 @@ def timed(metric_name: str = None):
         
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
-            start = time.time()
+            start_ns = time.perf_counter_ns()
             try:
                 return func(*args, **kwargs)
             finally:
-                duration = time.time() - start
+                duration = (time.perf_counter_ns() - start_ns) * 1e-9
                 logger.debug(
                     "Function executed",
                     function=func.__name__,
                     duration=duration,
                 )
         
-        import asyncio
         if asyncio.iscoroutinefunction(func):
             return async_wrapper
         return sync_wrapper
@@ -1,46 +1,96 @@
 """Security utilities for authentication and authorization."""
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple
 from uuid import UUID
 
+import bcrypt
+from cachetools import TTLCache
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.config import settings
 
-# Password hashing context
+# Password hashing context (only consulted for non-bcrypt legacy hashes)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Hash prefixes the bcrypt library verifies directly
+BCRYPT_PREFIXES = ("$2b$", "$2a$", "$2y$")
+
+# Dedicated pool for bcrypt so hashing never starves the default executor
+_BCRYPT_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(8, os.cpu_count() or 1),
+    thread_name_prefix="bcrypt",
+)
+
+# Verified token payloads keyed by token digest; entries also carry the
+# token's own expiry so a cached payload is never served past "exp"
+TOKEN_CACHE_TTL = 300
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=TOKEN_CACHE_TTL)
+_token_cache_lock = threading.Lock()
+
 
 def get_password_hash(password: str) -> str:
     """Hash a password using bcrypt."""
-    return pwd_context.hash(password)
+    salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("ascii")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
+    if hashed_password.startswith(BCRYPT_PREFIXES):
+        return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("ascii"))
+    
+    # Legacy hash formats still go through passlib
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def hash_secret(secret: str) -> str:
+    """
+    Hash a high-entropy secret (API key, session token) for storage.
+    
+    bcrypt's work factor only defends low-entropy passwords against brute
+    force; random tokens need a single SHA-256.
+    """
+    return hashlib.sha256(secret.encode("utf-8")).hexdigest()
+
+
+async def aget_password_hash(password: str) -> str:
+    """Hash a password using bcrypt without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_BCRYPT_EXECUTOR, get_password_hash, password)
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _BCRYPT_EXECUTOR, verify_password, plain_password, hashed_password
+    )
+
+
 def create_access_token(
     user_id: UUID,
     email: str,
     expires_delta: Optional[timedelta] = None,
 ) -> str:
     """Create a JWT access token."""
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(
-            minutes=settings.jwt_access_token_expire_minutes
-        )
+    if not expires_delta:
+        expires_delta = timedelta(minutes=settings.jwt_access_token_expire_minutes)
     
+    # Integer epoch claims: one clock read, no datetime conversion in jose
+    now = int(time.time())
     to_encode = {
         "sub": str(user_id),
         "email": email,
         "type": "access",
-        "exp": expire,
-        "iat": datetime.utcnow(),
+        "exp": now + int(expires_delta.total_seconds()),
+        "iat": now,
     }
     
     return jwt.encode(
@@ -55,18 +105,15 @@ def create_refresh_token(
     expires_delta: Optional[timedelta] = None,
 ) -> str:
     """Create a JWT refresh token."""
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(
-            days=settings.jwt_refresh_token_expire_days
-        )
+    if not expires_delta:
+        expires_delta = timedelta(days=settings.jwt_refresh_token_expire_days)
     
+    now = int(time.time())
     to_encode = {
         "sub": str(user_id),
         "type": "refresh",
-        "exp": expire,
-        "iat": datetime.utcnow(),
+        "exp": now + int(expires_delta.total_seconds()),
+        "iat": now,
     }
     
     return jwt.encode(
@@ -81,21 +128,58 @@ def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, A
     Verify a JWT token and return its payload.
     
     Returns None if the token is invalid or expired.
+    
+    Successfully decoded payloads are cached for up to TOKEN_CACHE_TTL
+    seconds (never beyond the token's expiry); failures are not cached.
+    Each call returns its own copy, so callers may modify it.
     """
-    try:
-        payload = jwt.decode(
-            token,
-            settings.jwt_secret_key,
-            algorithms=[settings.jwt_algorithm],
-        )
-        
-        # Verify token type
-        if payload.get("type") != token_type:
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    payload = _get_cached_payload(key)
+    
+    if payload is None:
+        try:
+            payload = jwt.decode(
+                token,
+                settings.jwt_secret_key,
+                algorithms=[settings.jwt_algorithm],
+            )
+        except JWTError:
             return None
         
-        return payload
-    except JWTError:
+        _cache_payload(key, payload)
+    
+    # Verify token type
+    if payload.get("type") != token_type:
+        return None
+    
+    return dict(payload)
+
+
+def _get_cached_payload(key: bytes) -> Optional[Dict[str, Any]]:
+    """Return a cached payload if present and its token has not expired."""
+    with _token_cache_lock:
+        entry: Optional[Tuple[Dict[str, Any], float]] = _token_cache.get(key)
+    
+    if entry is None:
+        return None
+    
+    payload, expires_at = entry
+    if time.time() >= expires_at:
         return None
+    return payload
+
+
+def _cache_payload(key: bytes, payload: Dict[str, Any]) -> None:
+    """Cache a verified payload until min(exp, now + TOKEN_CACHE_TTL)."""
+    now = time.time()
+    exp = payload.get("exp")
+    expires_at = min(exp, now + TOKEN_CACHE_TTL) if exp is not None else now + TOKEN_CACHE_TTL
+    
+    if expires_at <= now:
+        return
+    
+    with _token_cache_lock:
+        _token_cache[key] = (payload, expires_at)
 
 
 def decode_token(token: str) -> Optional[Dict[str, Any]]:
@@ -1,14 +1,18 @@
 """S3/MinIO storage utilities."""
+import asyncio
 import io
 import mimetypes
 import os
+import secrets
 from pathlib import Path
-from typing import BinaryIO, Dict, List, Optional
-from uuid import uuid4
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, Optional
 
 import aioboto3
+import boto3
 import structlog
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
+from botocore.exceptions import IncompleteReadError
 
 from app.config import settings
 
@@ -22,8 +26,46 @@ BUCKETS = {
     "voices": "neura-voices",
     "thumbnails": "neura-thumbnails",
     "temp": "neura-temp",
+    "tts_cache": "neura-tts-cache",
 }
 
+# Public-read bucket policy; only the bucket name varies
+_POLICY_TEMPLATE = (
+    '{"Version":"2012-10-17","Statement":[{"Effect":"Allow","Principal":"*",'
+    '"Action":["s3:GetObject"],"Resource":["arn:aws:s3:::%s/*"]}]}'
+)
+
+class _SafeFilenameTable(dict):
+    """str.translate table mapping unsafe filename chars to "_", filled on demand."""
+    
+    def __missing__(self, code: int):
+        char = chr(code)
+        value = code if char.isalnum() or char in ".-_" else "_"
+        self[code] = value
+        return value
+
+
+_SAFE_FILENAME_TABLE = _SafeFilenameTable()
+
+# Byte-level table for the (common) ASCII case: one C pass over a 256-entry LUT
+_SAFE_FILENAME_BYTES = bytes(
+    c if c < 128 and (chr(c).isalnum() or chr(c) in ".-_") else ord("_")
+    for c in range(256)
+)
+
+# Maximum keys per DeleteObjects request
+DELETE_BATCH_SIZE = 1000
+
+# Multipart transfer tuning: 8 MiB threshold, 16 MiB parts uploaded 10 at a
+# time, 1 MiB reads from disk
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_THRESHOLD,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=10,
+    io_chunksize=1024 * 1024,
+)
+
 
 class StorageClient:
     """Async S3/MinIO storage client with full feature support."""
@@ -32,9 +74,73 @@ class StorageClient:
         self.session = aioboto3.Session()
         self.default_bucket = settings.s3_bucket
         self._buckets_ensured = False
+        self._client_cfg = self._build_client_config()
+        
+        # Long-lived client, bound to the event loop it was opened on
+        self._client: Any = None
+        self._client_cm: Any = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client_lock: Optional[asyncio.Lock] = None
+        
+        # Sync boto3 client for URL signing and the small-call fast path (thread-safe)
+        self._sync_client: Any = None
+    
+    async def _get_client(self):
+        """
+        Get the shared S3 client, opening it on first use.
+        
+        aiobotocore clients are safe to share across coroutines but not
+        across event loops, so a new loop (e.g. one per Celery task) gets
+        its own client.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client_loop is not loop:
+            self._discard_client()
+            self._client_loop = loop
+            self._client_lock = asyncio.Lock()
+        
+        if self._client is None:
+            async with self._client_lock:
+                if self._client is None:
+                    client_cm = self.session.client(**self._client_cfg)
+                    self._client = await client_cm.__aenter__()
+                    self._client_cm = client_cm
+        
+        return self._client
+    
+    def _discard_client(self) -> None:
+        """
+        Drop the client bound to the previous event loop, closing its
+        connection pool on that loop if it is still running.
+        """
+        client_cm, old_loop = self._client_cm, self._client_loop
+        self._client = None
+        self._client_cm = None
+        if client_cm is None or old_loop is None:
+            return
+        
+        if old_loop.is_running():
+            asyncio.run_coroutine_threadsafe(client_cm.__aexit__(None, None, None), old_loop)
+        else:
+            # A stopped or closed loop can't run the close; its sockets go with it
+            logger.warning("Dropped S3 client bound to a stopped event loop")
+    
+    async def close(self) -> None:
+        """Close the shared S3 client opened on the running event loop."""
+        client_cm = self._client_cm
+        if client_cm is None or self._client_loop is not asyncio.get_running_loop():
+            return
+        
+        self._client = None
+        self._client_cm = None
+        await client_cm.__aexit__(None, None, None)
+    
+    def rebuild_config(self) -> None:
+        """Rebuild the cached client configuration (after settings change)."""
+        self._client_cfg = self._build_client_config()
     
-    def _get_client_config(self) -> Dict:
-        """Get S3 client configuration."""
+    def _build_client_config(self) -> Dict:
+        """Build S3 client configuration (cached on the instance)."""
         return {
             "service_name": "s3",
             "endpoint_url": settings.s3_endpoint,
@@ -44,44 +150,72 @@ class StorageClient:
             "config": Config(
                 signature_version="s3v4",
                 s3={"addressing_style": "path"},
+                # The shared client's pool caps concurrent S3 calls
+                max_pool_connections=64,
+                retries={"mode": "adaptive", "max_attempts": 5},
+                tcp_keepalive=True,
+                connect_timeout=5,
+                read_timeout=60,
             ),
         }
     
+    def _get_sync_client(self):
+        """Get the shared sync boto3 client, creating it on first use."""
+        if self._sync_client is None:
+            self._sync_client = boto3.client(**self._client_cfg)
+        return self._sync_client
+    
+    async def _call(self, operation: str, **params) -> Any:
+        """
+        Run a small S3 call (head/delete).
+        
+        With S3_SYNC_FAST_PATH enabled, the call goes through a shared sync
+        boto3 client in a worker thread, which beats aiohttp's per-call
+        overhead for tiny requests. Large transfers always use aioboto3.
+        """
+        if settings.s3_sync_fast_path:
+            client = self._get_sync_client()
+            return await asyncio.to_thread(getattr(client, operation), **params)
+        
+        s3 = await self._get_client()
+        return await getattr(s3, operation)(**params)
+    
     async def ensure_buckets(self) -> None:
         """Ensure all required buckets exist."""
         if self._buckets_ensured:
             return
         
-        async with self.session.client(**self._get_client_config()) as s3:
-            for name, bucket in BUCKETS.items():
-                try:
-                    await s3.head_bucket(Bucket=bucket)
-                    logger.debug(f"Bucket {bucket} exists")
-                except Exception:
-                    try:
-                        await s3.create_bucket(Bucket=bucket)
-                        logger.info(f"Created bucket: {bucket}")
-                        
-                        # Set bucket policy for public read (videos/thumbnails/avatars/voices)
-                        if name in ["videos", "thumbnails", "avatars", "voices"]:
-                            policy = {
-                                "Version": "2012-10-17",
-                                "Statement": [{
-                                    "Effect": "Allow",
-                                    "Principal": "*",
-                                    "Action": ["s3:GetObject"],
-                                    "Resource": [f"arn:aws:s3:::{bucket}/*"]
-                                }]
-                            }
-                            import json
-                            await s3.put_bucket_policy(
-                                Bucket=bucket,
-                                Policy=json.dumps(policy)
-                            )
-                    except Exception as e:
-                        logger.warning(f"Could not create bucket {bucket}: {e}")
-        
-        self._buckets_ensured = True
+        # Probe all buckets concurrently over the shared client; concurrent
+        # first uploads (a job's video and audio) wait for a single probe
+        s3 = await self._get_client()
+        async with self._client_lock:
+            if self._buckets_ensured:
+                return
+            await asyncio.gather(
+                *(self._ensure_bucket(s3, name, bucket) for name, bucket in BUCKETS.items()),
+                return_exceptions=True,
+            )
+            
+            self._buckets_ensured = True
+    
+    async def _ensure_bucket(self, s3, name: str, bucket: str) -> None:
+        """Create a bucket (and its public-read policy) if it doesn't exist."""
+        try:
+            await s3.head_bucket(Bucket=bucket)
+            logger.debug(f"Bucket {bucket} exists")
+        except Exception:
+            try:
+                await s3.create_bucket(Bucket=bucket)
+                logger.info(f"Created bucket: {bucket}")
+                
+                # Set bucket policy for public read (videos/thumbnails/avatars/voices)
+                if name in ["videos", "thumbnails", "avatars", "voices"]:
+                    await s3.put_bucket_policy(
+                        Bucket=bucket,
+                        Policy=_POLICY_TEMPLATE % bucket,
+                    )
+            except Exception as e:
+                logger.warning(f"Could not create bucket {bucket}: {e}")
     
     async def upload_file(
         self,
@@ -109,22 +243,22 @@ class StorageClient:
             content_type, _ = mimetypes.guess_type(file_path)
             content_type = content_type or "application/octet-stream"
         
-        async with self.session.client(**self._get_client_config()) as s3:
-            with open(file_path, "rb") as f:
-                await s3.upload_fileobj(
-                    f,
-                    bucket,
-                    key,
-                    ExtraArgs={
-                        "ContentType": content_type,
-                        "ACL": "public-read" if bucket in [BUCKETS["videos"], BUCKETS["thumbnails"], BUCKETS["avatars"], BUCKETS["voices"]] else "private",
-                    }
-                )
-            
-            logger.info("File uploaded", bucket=bucket, key=key, content_type=content_type)
-            
-            # Return public URL
-            return self._get_public_url(bucket, key)
+        s3 = await self._get_client()
+        await s3.upload_file(
+            Filename=file_path,
+            Bucket=bucket,
+            Key=key,
+            ExtraArgs={
+                "ContentType": content_type,
+                "ACL": "public-read" if bucket in [BUCKETS["videos"], BUCKETS["thumbnails"], BUCKETS["avatars"], BUCKETS["voices"]] else "private",
+            },
+            Config=_TRANSFER_CONFIG,
+        )
+        
+        logger.info("File uploaded", bucket=bucket, key=key, content_type=content_type)
+        
+        # Return public URL
+        return self._get_public_url(bucket, key)
     
     async def upload_fileobj(
         self,
@@ -136,13 +270,13 @@ class StorageClient:
         """Upload a file object to S3."""
         await self.ensure_buckets()
         
-        async with self.session.client(**self._get_client_config()) as s3:
-            extra_args = {"ContentType": content_type} if content_type else {}
-            
-            await s3.upload_fileobj(file, bucket, key, ExtraArgs=extra_args)
-            
-            logger.info("File uploaded", bucket=bucket, key=key)
-            return self._get_public_url(bucket, key)
+        s3 = await self._get_client()
+        extra_args = {"ContentType": content_type} if content_type else {}
+        
+        await s3.upload_fileobj(file, bucket, key, ExtraArgs=extra_args, Config=_TRANSFER_CONFIG)
+        
+        logger.info("File uploaded", bucket=bucket, key=key)
+        return self._get_public_url(bucket, key)
     
     async def upload_bytes(
         self,
@@ -151,55 +285,93 @@ class StorageClient:
         key: str,
         content_type: Optional[str] = None,
     ) -> str:
-        """Upload bytes to S3."""
-        return await self.upload_fileobj(io.BytesIO(data), bucket, key, content_type)
+        """Upload bytes to S3 (single PUT below the multipart threshold)."""
+        if len(data) >= MULTIPART_THRESHOLD:
+            return await self.upload_fileobj(io.BytesIO(data), bucket, key, content_type)
+        
+        await self.ensure_buckets()
+        
+        s3 = await self._get_client()
+        extra_args = {"ContentType": content_type} if content_type else {}
+        
+        await s3.put_object(Bucket=bucket, Key=key, Body=data, **extra_args)
+        
+        logger.info("File uploaded", bucket=bucket, key=key)
+        return self._get_public_url(bucket, key)
     
     async def download_file(
         self,
         bucket: str,
         key: str,
         destination: Optional[str] = None,
-    ) -> bytes:
+    ) -> Optional[bytearray]:
         """
         Download a file from S3.
         
         Args:
             bucket: Source bucket
             key: Object key
-            destination: Optional local file path to save to
+            destination: Optional local file path to stream to
         
         Returns:
-            File contents as bytes
+            File contents (a bytearray, filled in place without a final
+            copy), or None when written to destination
+        
+        Raises:
+            IncompleteReadError: If the body is shorter or longer than its
+                Content-Length
         """
-        async with self.session.client(**self._get_client_config()) as s3:
-            response = await s3.get_object(Bucket=bucket, Key=key)
-            data = await response["Body"].read()
-            
-            if destination:
-                Path(destination).parent.mkdir(parents=True, exist_ok=True)
-                Path(destination).write_bytes(data)
-            
-            logger.info("File downloaded", bucket=bucket, key=key)
-            return data
+        s3 = await self._get_client()
+        
+        if destination:
+            # Parallel ranged GETs straight to disk; never held in memory
+            Path(destination).parent.mkdir(parents=True, exist_ok=True)
+            await s3.download_file(bucket, key, destination, Config=_TRANSFER_CONFIG)
+            logger.info("File downloaded", bucket=bucket, key=key, destination=destination)
+            return None
+        
+        response = await s3.get_object(Bucket=bucket, Key=key)
+        
+        # Fill one pre-sized buffer rather than joining a list of chunks
+        expected = response["ContentLength"]
+        data = bytearray(expected)
+        offset = 0
+        with memoryview(data) as view:
+            async for chunk in response["Body"].iter_chunks(1024 * 1024):
+                end = offset + len(chunk)
+                if end > expected:
+                    raise IncompleteReadError(actual_bytes=end, expected_bytes=expected)
+                view[offset:end] = chunk
+                offset = end
+        
+        # A stream that ends early would leave zero bytes at the tail
+        if offset != expected:
+            raise IncompleteReadError(actual_bytes=offset, expected_bytes=expected)
+        
+        logger.info("File downloaded", bucket=bucket, key=key)
+        return data
     
     async def delete_file(self, bucket: str, key: str) -> None:
         """Delete a file from S3."""
-        async with self.session.client(**self._get_client_config()) as s3:
-            await s3.delete_object(Bucket=bucket, Key=key)
-            logger.info("File deleted", bucket=bucket, key=key)
+        await self._call("delete_object", Bucket=bucket, Key=key)
+        logger.info("File deleted", bucket=bucket, key=key)
     
     async def delete_files(self, bucket: str, keys: List[str]) -> None:
         """Delete multiple files from S3."""
         if not keys:
             return
         
-        async with self.session.client(**self._get_client_config()) as s3:
-            objects = [{"Key": key} for key in keys]
-            await s3.delete_objects(
+        # S3 accepts at most 1000 keys per DeleteObjects request
+        s3 = await self._get_client()
+        batches = [keys[i:i + DELETE_BATCH_SIZE] for i in range(0, len(keys), DELETE_BATCH_SIZE)]
+        await asyncio.gather(*(
+            s3.delete_objects(
                 Bucket=bucket,
-                Delete={"Objects": objects}
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
             )
-            logger.info(f"Deleted {len(keys)} files from {bucket}")
+            for batch in batches
+        ))
+        logger.info(f"Deleted {len(keys)} files from {bucket}")
     
     async def get_presigned_url(
         self,
@@ -220,13 +392,12 @@ class StorageClient:
         Returns:
             Presigned URL
         """
-        async with self.session.client(**self._get_client_config()) as s3:
-            url = await s3.generate_presigned_url(
-                method,
-                Params={"Bucket": bucket, "Key": key},
-                ExpiresIn=expires_in,
-            )
-            return url
+        # Presigning is local SigV4 math (no request), so sign inline
+        return self._get_sync_client().generate_presigned_url(
+            method,
+            Params={"Bucket": bucket, "Key": key},
+            ExpiresIn=expires_in,
+        )
     
     async def get_presigned_upload_url(
         self,
@@ -241,64 +412,65 @@ class StorageClient:
         Returns:
             Dictionary with 'url' and 'fields' for form upload
         """
-        async with self.session.client(**self._get_client_config()) as s3:
-            result = await s3.generate_presigned_post(
-                Bucket=bucket,
-                Key=key,
-                Fields={"Content-Type": content_type},
-                Conditions=[
-                    {"Content-Type": content_type},
-                    ["content-length-range", 1, 500 * 1024 * 1024],  # 500MB max
-                ],
-                ExpiresIn=expires_in,
-            )
-            return result
+        result = self._get_sync_client().generate_presigned_post(
+            Bucket=bucket,
+            Key=key,
+            Fields={"Content-Type": content_type},
+            Conditions=[
+                {"Content-Type": content_type},
+                ["content-length-range", 1, 500 * 1024 * 1024],  # 500MB max
+            ],
+            ExpiresIn=expires_in,
+        )
+        return result
     
     async def file_exists(self, bucket: str, key: str) -> bool:
         """Check if a file exists in S3."""
-        async with self.session.client(**self._get_client_config()) as s3:
-            try:
-                await s3.head_object(Bucket=bucket, Key=key)
-                return True
-            except Exception:
-                return False
+        try:
+            await self._call("head_object", Bucket=bucket, Key=key)
+            return True
+        except Exception:
+            return False
     
     async def get_file_info(self, bucket: str, key: str) -> Optional[Dict]:
         """Get file metadata."""
-        async with self.session.client(**self._get_client_config()) as s3:
-            try:
-                response = await s3.head_object(Bucket=bucket, Key=key)
-                return {
-                    "size": response["ContentLength"],
-                    "content_type": response.get("ContentType"),
-                    "last_modified": response["LastModified"],
-                    "etag": response["ETag"],
-                }
-            except Exception:
-                return None
+        try:
+            response = await self._call("head_object", Bucket=bucket, Key=key)
+            return {
+                "size": response["ContentLength"],
+                "content_type": response.get("ContentType"),
+                "last_modified": response["LastModified"],
+                "etag": response["ETag"],
+            }
+        except Exception:
+            return None
     
     async def list_files(
         self,
         bucket: str,
         prefix: str = "",
-        max_keys: int = 1000,
-    ) -> List[Dict]:
-        """List files in a bucket with optional prefix."""
-        async with self.session.client(**self._get_client_config()) as s3:
-            response = await s3.list_objects_v2(
-                Bucket=bucket,
-                Prefix=prefix,
-                MaxKeys=max_keys,
-            )
-            
-            return [
-                {
+        page_size: int = 1000,
+    ) -> AsyncIterator[Dict]:
+        """
+        Iterate over files in a bucket with optional prefix.
+        
+        Follows list_objects_v2 continuation tokens, so every matching key is
+        yielded, one page at a time. Collect with
+        ``[f async for f in storage_client.list_files(...)]`` when a list is needed.
+        """
+        s3 = await self._get_client()
+        paginator = s3.get_paginator("list_objects_v2")
+        async for page in paginator.paginate(
+            Bucket=bucket,
+            Prefix=prefix,
+            PaginationConfig={"PageSize": page_size},
+        ):
+            for obj in page.get("Contents", []):
+                yield {
                     "key": obj["Key"],
                     "size": obj["Size"],
                     "last_modified": obj["LastModified"],
                 }
-                for obj in response.get("Contents", [])
-            ]
     
     async def copy_file(
         self,
@@ -308,13 +480,13 @@ class StorageClient:
         dest_key: str,
     ) -> str:
         """Copy a file within S3."""
-        async with self.session.client(**self._get_client_config()) as s3:
-            await s3.copy_object(
-                Bucket=dest_bucket,
-                Key=dest_key,
-                CopySource={"Bucket": source_bucket, "Key": source_key},
-            )
-            return self._get_public_url(dest_bucket, dest_key)
+        s3 = await self._get_client()
+        await s3.copy_object(
+            Bucket=dest_bucket,
+            Key=dest_key,
+            CopySource={"Bucket": source_bucket, "Key": source_key},
+        )
+        return self._get_public_url(dest_bucket, dest_key)
     
     def _get_public_url(self, bucket: str, key: str) -> str:
         """Get the public URL for an object."""
@@ -342,17 +514,17 @@ class StorageClient:
             Storage key
         """
         # Clean filename
-        safe_filename = "".join(
-            c if c.isalnum() or c in ".-_" else "_"
-            for c in filename
-        )
+        if filename.isascii():
+            safe_filename = filename.encode("ascii").translate(_SAFE_FILENAME_BYTES).decode("ascii")
+        else:
+            safe_filename = filename.translate(_SAFE_FILENAME_TABLE)
         
         parts = [prefix]
         if user_id:
             parts.append(user_id)
         
         if unique:
-            unique_id = uuid4().hex[:8]
+            unique_id = secrets.token_hex(4)
             parts.append(f"{unique_id}_{safe_filename}")
         else:
             parts.append(safe_filename)
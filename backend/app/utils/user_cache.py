@@ -0,0 +1,111 @@
+"""Short-TTL Redis cache for authenticated user lookups."""
+import pickle
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+import structlog
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import settings
+from app.database import run_after_commit
+from app.models.user import User
+
+logger = structlog.get_logger()
+
+# Seconds a user snapshot may be served without hitting the database
+USER_CACHE_TTL = 15
+
+# Credentials never leave the database; endpoints that need them query them
+_UNCACHED_COLUMNS = frozenset({"password_hash"})
+
+
+class UserCache:
+    """
+    Redis-backed cache of user row snapshots keyed by user ID.
+    
+    The JWT already authenticates the caller, so the per-request users SELECT
+    only refreshes mutable fields; a short TTL amortizes it across bursts.
+    Snapshots are re-attached to the request session so endpoints can keep
+    mutating the returned User as usual.
+    """
+    
+    def __init__(self, redis_url: Optional[str] = None, ttl: int = USER_CACHE_TTL):
+        self.ttl = ttl
+        self._redis = None
+        self._redis_url = redis_url or settings.redis_url
+    
+    async def _get_redis(self):
+        """Get or create Redis connection."""
+        if self._redis is None:
+            try:
+                import redis.asyncio as redis
+                self._redis = redis.from_url(self._redis_url)
+            except Exception as e:
+                logger.warning("Redis not available for user cache", error=str(e))
+        return self._redis
+    
+    @staticmethod
+    def _key(user_id: UUID) -> str:
+        return f"user:{user_id}"
+    
+    async def get(self, user_id: UUID, db: AsyncSession) -> Optional[User]:
+        """Get a cached user attached to the given session, or None on miss."""
+        redis = await self._get_redis()
+        if not redis:
+            return None
+        
+        try:
+            data = await redis.get(self._key(user_id))
+        except Exception as e:
+            logger.warning("User cache read failed", error=str(e))
+            return None
+        
+        if data is None:
+            return None
+        
+        snapshot: Dict[str, Any] = pickle.loads(data)
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+    
+    async def set(self, user: User) -> None:
+        """Store a snapshot of the user's column values."""
+        redis = await self._get_redis()
+        if not redis:
+            return
+        
+        snapshot = {
+            attr.key: getattr(user, attr.key)
+            for attr in inspect(User).column_attrs
+            if attr.key not in _UNCACHED_COLUMNS
+        }
+        try:
+            await redis.set(self._key(user.id), pickle.dumps(snapshot), ex=self.ttl)
+        except Exception as e:
+            logger.warning("User cache write failed", error=str(e))
+    
+    async def invalidate(self, user_id: UUID) -> None:
+        """Drop a user's snapshot after it changes."""
+        redis = await self._get_redis()
+        if not redis:
+            return
+        
+        try:
+            await redis.delete(self._key(user_id))
+        except Exception as e:
+            logger.warning("User cache invalidation failed", error=str(e))
+    
+    def invalidate_after_commit(self, db: AsyncSession, user_id: UUID) -> None:
+        """Drop a user's snapshot once db's pending changes to it are committed."""
+        run_after_commit(db, lambda: self.invalidate(user_id))
+    
+    async def close(self) -> None:
+        """Close the Redis connection pool, if one was opened."""
+        redis, self._redis = self._redis, None
+        if redis is not None:
+            await redis.aclose()
+
+
+user_cache = UserCache()
@@ -14,21 +14,30 @@ celery_app = Celery(
 
 # Celery configuration
 celery_app.conf.update(
-    # Task settings
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    # Task settings (msgpack payloads; JSON still accepted from older producers)
+    task_serializer="msgpack",
+    accept_content=["msgpack", "json"],
+    result_serializer="msgpack",
+    result_accept_content=["msgpack", "json"],
     timezone="UTC",
     enable_utc=True,
     
+    # Broker connection settings: keep pooled Redis connections alive so bulk
+    # publishes (e.g. re-queued job groups) reuse one warm connection
+    broker_transport_options={
+        "socket_keepalive": True,
+        "health_check_interval": 30,
+    },
+    
     # Task execution settings
     task_acks_late=True,
     task_reject_on_worker_lost=True,
     task_time_limit=3600,  # 1 hour max
     task_soft_time_limit=3300,  # 55 minutes soft limit
     
-    # Worker settings
-    worker_prefetch_multiplier=1,
+    # Worker settings (prefetch 1 so minute-long jobs aren't hoarded by one
+    # worker; CELERY_PREFETCH_MULTIPLIER overrides it per deployment)
+    worker_prefetch_multiplier=settings.celery_prefetch_multiplier,
     worker_concurrency=2,
     
     # Result backend settings
@@ -50,6 +59,12 @@ celery_app.conf.update(
 # Task routes for different queues
 celery_app.conf.task_routes = {
     "app.workers.tasks.video_generation.*": {"queue": "gpu"},
+    # Video pipeline stages: GPU-bound work on gpu, I/O and bookkeeping on default
+    "app.workers.tasks.video_tts_stage": {"queue": "gpu"},
+    "app.workers.tasks.video_render_stage": {"queue": "gpu"},
+    "app.workers.tasks.video_upload_stage": {"queue": "default"},
+    "app.workers.tasks.video_finalize_stage": {"queue": "default"},
+    "app.workers.tasks.video_pipeline_failed": {"queue": "default"},
     "app.workers.tasks.tts_generation.*": {"queue": "gpu"},
     "app.workers.tasks.*": {"queue": "default"},
 }
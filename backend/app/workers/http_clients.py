@@ -0,0 +1,38 @@
+"""Pooled HTTP client for calls from worker tasks to the TTS/avatar services."""
+import asyncio
+import weakref
+
+import httpx
+
+# Errors from a pooled connection the server already closed; safe to retry
+STALE_CONNECTION_ERRORS = (httpx.ConnectError, httpx.RemoteProtocolError, httpx.ReadError)
+
+# Defaults; long calls (synthesis, rendering, long-polls) pass their own timeout
+HTTP_TIMEOUT = httpx.Timeout(connect=5.0, read=300.0, write=30.0, pool=5.0)
+HTTP_LIMITS = httpx.Limits(
+    max_keepalive_connections=20,
+    max_connections=100,
+    keepalive_expiry=15.0,  # Drop idle sockets before typical proxy idle timeouts
+)
+
+# One client per event loop: httpx connection pools are bound to the loop
+# that opened them
+_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]"
+_http_clients = weakref.WeakKeyDictionary()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the HTTP client bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS)
+        _http_clients[loop] = client
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the running event loop's HTTP client, if one was opened."""
+    client = _http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -1,17 +1,57 @@
 """Celery tasks for background processing."""
+import ast
 import asyncio
+import hashlib
 import os
+import random
+import re
+import shutil
+import sys
 import tempfile
+import threading
+import time
+import wave
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
+import aiofiles
 import httpx
+import numpy as np
+import orjson
 import structlog
+from botocore.exceptions import ConnectionError as BotoConnectionError
+from botocore.exceptions import HTTPClientError as BotoHTTPClientError
+from celery import chain, group
+from celery.signals import after_setup_logger, worker_process_init, worker_process_shutdown, worker_shutdown
+from sqlalchemy import Uuid, cast, delete, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 
 from app.config import settings
+from app.models.job import Job
+from app.models.user import Session, User
+from app.models.video import Video
+from app.utils.job_progress import JobProgressStore
+from app.utils.logging import setup_logging
+from app.utils.storage import BUCKETS, storage_client
+from app.utils.user_cache import UserCache
 from app.workers.celery_app import celery_app
+from app.workers.http_clients import STALE_CONNECTION_ERRORS, close_http_client, get_http_client
+
+try:
+    import uvloop  # installed with uvicorn[standard]
+except ImportError:
+    uvloop = None
+
+try:
+    from app.utils.emotion import detect_emotion_from_text_async
+except ImportError:
+    detect_emotion_from_text_async = None
 
 logger = structlog.get_logger()
 
@@ -20,65 +60,97 @@ logger = structlog.get_logger()
 TTS_SERVICE_URL = os.getenv("TTS_SERVICE_URL", settings.tts_service_url)
 AVATAR_SERVICE_URL = os.getenv("AVATAR_SERVICE_URL", settings.avatar_service_url)
 
+# Output frame size per resolution
+RESOLUTION_MAP = MappingProxyType({
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+})
 
 
-import re
+# Script cleanup patterns for TTS, compiled once at import
+# Timestamps/section headers like [0:00 - 0:10 | Hook]
+_TTS_TIMESTAMP_RE = re.compile(r"\[\d{1,2}:\d{2}.*?\]")
+# Visual cues like [VISUAL: ...]
+_TTS_VISUAL_RE = re.compile(r"\[vis.*?\]", re.IGNORECASE)
+# [PAUSE] or similar tags
+_TTS_PAUSE_RE = re.compile(r"\[pause.*?\]", re.IGNORECASE)
+
 
 def clean_text_for_tts(text: str) -> str:
     """Clean text before sending to TTS service."""
     if not text:
         return ""
-        
-    # Remove timestamps/section headers like [0:00 - 0:10 | Hook]
-    text = re.sub(r'\[\d{1,2}:\d{2}.*?\]', '', text)
     
-    # Remove visual cues like [VISUAL: ...]
-    text = re.sub(r'\[vis.*?\]', '', text, flags=re.IGNORECASE)
+    text = _TTS_TIMESTAMP_RE.sub("", text)
+    text = _TTS_VISUAL_RE.sub("", text)
     
     # Remove standalone headers (e.g. "Title | Topic")
     # Heuristic: line contains "|" and is short
-    lines = []
-    for line in text.split('\n'):
-        if '|' in line and len(line) < 100:
-            continue
-        lines.append(line)
-    text = '\n'.join(lines)
+    text = "\n".join(
+        line for line in text.split("\n")
+        if not ("|" in line and len(line) < 100)
+    )
     
     # Replace [PAUSE] or similar tags with breaks
-    text = re.sub(r'\[pause.*?\]', '... ', text, flags=re.IGNORECASE)
+    text = _TTS_PAUSE_RE.sub("... ", text)
     
-    # Clean extra whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
+    # Collapse whitespace runs (str.split() splits on exactly what \s+ matches)
+    return " ".join(text.split())
+
+
+def parse_word_timings(header_value: str) -> List[Dict[str, Any]]:
+    """Parse the TTS service's X-Word-Timings header."""
+    try:
+        return orjson.loads(header_value)
+    except orjson.JSONDecodeError:
+        pass
     
-    return text
+    # Older TTS services sent str() of the list (a Python literal)
+    try:
+        return ast.literal_eval(header_value) if header_value else []
+    except (ValueError, SyntaxError):
+        return []
 
 
-# Worker-safe database context that creates fresh engine per task
+# Worker-safe database context: one engine (and pool) per event loop
 from contextlib import asynccontextmanager
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession, async_sessionmaker
+
+_worker_engines: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[AsyncEngine, async_sessionmaker]]"
+_worker_engines = weakref.WeakKeyDictionary()
+
+
+def _get_worker_session_maker() -> async_sessionmaker:
+    """Get the session factory bound to the running event loop's engine."""
+    loop = asyncio.get_running_loop()
+    cached = _worker_engines.get(loop)
+    if cached is None:
+        engine = create_async_engine(
+            settings.db_url,
+            echo=False,
+            pool_pre_ping=True,
+            pool_recycle=1800,
+            pool_size=10,
+            max_overflow=20,
+        )
+        session_maker = async_sessionmaker(
+            engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+        cached = _worker_engines[loop] = (engine, session_maker)
+    return cached[1]
+
 
 @asynccontextmanager
 async def get_worker_db():
-    """Create a fresh database session for Celery workers.
+    """Get a database session for Celery workers.
     
-    This avoids the 'Future attached to different loop' error by creating
-    a new engine bound to the current event loop.
+    Engines are cached per event loop (asyncpg connections can't cross loops),
+    so tasks on the worker's long-lived loop share one connection pool.
     """
-    from app.config import settings
-    
-    # Create fresh engine for this event loop
-    engine = create_async_engine(
-        settings.db_url,
-        echo=False,
-        pool_pre_ping=True,
-        pool_size=5,
-    )
-    
-    session_maker = async_sessionmaker(
-        engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-    )
+    session_maker = _get_worker_session_maker()
     
     async with session_maker() as session:
         try:
@@ -89,44 +161,207 @@ async def get_worker_db():
             raise
         finally:
             await session.close()
+
+
+# One long-lived event loop per worker process, so engines, Redis pools and
+# the S3 client opened by one task are reused by the next
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_thread: Optional[threading.Thread] = None
+_worker_loop_lock = threading.Lock()
+
+
+def _start_worker_loop() -> asyncio.AbstractEventLoop:
+    """Start the worker's event loop on a background thread."""
+    global _worker_loop, _worker_thread
     
-    # Dispose engine after use
-    await engine.dispose()
+    loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+    if hasattr(asyncio, "eager_task_factory"):
+        # Python 3.12+: tasks run inline until their first real suspension
+        loop.set_task_factory(asyncio.eager_task_factory)
+    thread = threading.Thread(target=loop.run_forever, name="worker-loop", daemon=True)
+    thread.start()
+    _worker_loop, _worker_thread = loop, thread
+    return loop
+
+
+@worker_process_init.connect
+def init_worker_loop(**kwargs) -> None:
+    """Give each forked worker process its own loop (never inherit the parent's)."""
+    with _worker_loop_lock:
+        _start_worker_loop()
+
+
+@after_setup_logger.connect
+def configure_worker_logging(**kwargs) -> None:
+    """Use the app's structlog setup (and its level filtering) in workers too."""
+    setup_logging()
 
 
 def run_async(coro):
     """Helper to run async code in Celery tasks."""
-    # Always create a new event loop for Celery tasks
-    # This ensures clean async execution in prefork workers
-    try:
-        # Close any existing loop in this thread
-        loop = asyncio.get_event_loop()
-        if not loop.is_closed():
-            loop.close()
-    except RuntimeError:
-        pass
-    
-    # Create a fresh event loop
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    loop = _worker_loop
+    if loop is None or loop.is_closed():
+        # Solo/threads pools and eager mode don't fire worker_process_init
+        with _worker_loop_lock:
+            loop = _worker_loop
+            if loop is None or loop.is_closed():
+                loop = _start_worker_loop()
     
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+# Chunk size for streaming service responses to disk
+STREAM_CHUNK_SIZE = 1 << 16
+
+# Render status long-poll window, and the backoff used when the avatar
+# service doesn't support long-polling
+RENDER_STATUS_WAIT = 30.0
+RENDER_POLL_INITIAL_DELAY = 0.25
+RENDER_POLL_MAX_DELAY = 5.0
+
+
+def dispose_worker_engine() -> None:
+    """Dispose the worker loop's database engine."""
+    loop = _worker_loop
+    cached = _worker_engines.get(loop) if loop is not None else None
+    if cached is None or loop.is_closed():
+        return
     try:
-        return loop.run_until_complete(coro)
-    finally:
-        # Clean up
+        asyncio.run_coroutine_threadsafe(cached[0].dispose(), loop).result(timeout=5.0)
+    except Exception as e:
+        logger.warning("Failed to dispose worker database engine", error=str(e))
+
+
+# One progress store and user cache per event loop: their Redis pools are
+# bound to the loop
+_job_progress_stores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, JobProgressStore]"
+_job_progress_stores = weakref.WeakKeyDictionary()
+_user_caches: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, UserCache]"
+_user_caches = weakref.WeakKeyDictionary()
+
+
+def get_job_progress() -> JobProgressStore:
+    """Get the job progress store bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    store = _job_progress_stores.get(loop)
+    if store is None:
+        store = _job_progress_stores[loop] = JobProgressStore()
+    return store
+
+
+def get_user_cache() -> UserCache:
+    """Get the user cache bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    cache = _user_caches.get(loop)
+    if cache is None:
+        cache = _user_caches[loop] = UserCache()
+    return cache
+
+
+def close_redis_clients() -> None:
+    """Close the worker loop's job progress store and user cache."""
+    loop = _worker_loop
+    if loop is None:
+        return
+    clients = [
+        client
+        for client in (_job_progress_stores.pop(loop, None), _user_caches.pop(loop, None))
+        if client is not None
+    ]
+    if not clients or loop.is_closed():
+        return
+    for client in clients:
         try:
-            # Cancel any remaining tasks
-            pending = [t for t in asyncio.all_tasks(loop) if not t.done()]
-            if pending:
-                for task in pending:
-                    task.cancel()
-                # Wait for cancellations
-                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-        except Exception:
-            pass
-        finally:
+            asyncio.run_coroutine_threadsafe(client.close(), loop).result(timeout=5.0)
+        except Exception as e:
+            logger.warning("Failed to close Redis client", error=str(e))
+
+
+def close_http_clients() -> None:
+    """Close the worker loop's HTTP and S3 clients."""
+    loop = _worker_loop
+    if loop is None or loop.is_closed():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(close_http_client(), loop).result(timeout=5.0)
+    except Exception as e:
+        logger.warning("Failed to close HTTP client", error=str(e))
+    try:
+        asyncio.run_coroutine_threadsafe(storage_client.close(), loop).result(timeout=5.0)
+    except Exception as e:
+        logger.warning("Failed to close S3 client", error=str(e))
+
+
+# Local TTS engine used when the TTS service is down; loading the model is
+# slow, so it's initialized once per worker process and kept until shutdown
+_fallback_tts_engine = None
+_fallback_tts_lock: Optional[asyncio.Lock] = None
+
+
+async def _get_fallback_tts_engine():
+    """Get the local TTS engine, initializing it on first use."""
+    global _fallback_tts_engine, _fallback_tts_lock
+    if _fallback_tts_engine is None:
+        if _fallback_tts_lock is None:
+            _fallback_tts_lock = asyncio.Lock()
+        # Concurrent fallbacks on the worker loop wait for a single model load
+        async with _fallback_tts_lock:
+            if _fallback_tts_engine is None:
+                # Stays local: the services package isn't part of the backend
+                # image, so a module-level import would break worker startup
+                from services.tts.engine import TTSEngine
+                engine = TTSEngine()
+                await engine.initialize()
+                _fallback_tts_engine = engine
+    return _fallback_tts_engine
+
+
+def release_fallback_tts_engine() -> None:
+    """Drop the local TTS engine and free the GPU memory its model held."""
+    global _fallback_tts_engine, _fallback_tts_lock
+    if _fallback_tts_engine is None:
+        return
+    _fallback_tts_engine = _fallback_tts_lock = None
+    
+    torch = sys.modules.get("torch")  # Only loaded if the engine was
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+@worker_shutdown.connect
+@worker_process_shutdown.connect
+def stop_worker_loop(**kwargs) -> None:
+    """
+    Release the loop's pooled resources, then stop the worker loop.
+    
+    Connected to both signals: prefork children fire worker_process_shutdown,
+    solo/threads pools only fire worker_shutdown.
+    """
+    global _worker_loop, _worker_thread
+    
+    with _worker_loop_lock:
+        loop, thread = _worker_loop, _worker_thread
+        if loop is None or loop.is_closed():
+            return
+        
+        dispose_worker_engine()
+        close_http_clients()
+        close_redis_clients()
+        release_fallback_tts_engine()
+        
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=5.0)
+        if not loop.is_running():
             loop.close()
-            asyncio.set_event_loop(None)
+        _worker_loop = _worker_thread = None
+
+
+async def _stream_to_file(response: httpx.Response, dest_path: str) -> None:
+    """Write a streamed response body to disk chunk by chunk."""
+    async with aiofiles.open(dest_path, "wb") as f:
+        async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+            await f.write(chunk)
 
 
 async def call_tts_service(
@@ -134,73 +369,70 @@ async def call_tts_service(
     voice_id: str = "default",
     language: str = "en",
     speed: float = 1.0,
+    dest_path: Optional[str] = None,
 ) -> Dict[str, Any]:
-    """Call TTS service to generate audio with retry logic."""
+    """
+    Call TTS service to generate audio with retry logic.
+    
+    The audio is streamed to dest_path (or discarded when it's None) rather
+    than buffered in memory.
+    """
     max_retries = 3
     retry_delay = 2.0
     
     for attempt in range(max_retries):
         try:
-            async with httpx.AsyncClient(timeout=300.0) as client:
-                # Check service health first
-                try:
-                    health_response = await client.get(f"{TTS_SERVICE_URL}/health", timeout=5.0)
-                    if health_response.status_code != 200:
-                        logger.warning(
-                            "TTS service health check failed",
-                            status=health_response.status_code,
-                            attempt=attempt + 1,
-                        )
-                except Exception as e:
-                    logger.warning(
-                        "TTS service health check error",
-                        error=str(e),
-                        attempt=attempt + 1,
-                    )
-                
-                response = await client.post(
-                    f"{TTS_SERVICE_URL}/synthesize",
-                    json={
-                        "text": text,
-                        "voice_id": voice_id,
-                        "language": language,
-                        "speed": speed,
-                    },
-                )
-                
+            # No separate /health probe: a 503, timeout or connection error
+            # from the real request drives the retry loop below
+            async with get_http_client().stream(
+                "POST",
+                f"{TTS_SERVICE_URL}/synthesize",
+                json={
+                    "text": text,
+                    "voice_id": voice_id,
+                    "language": language,
+                    "speed": speed,
+                },
+            ) as response:
                 if response.status_code == 200:
                     # Get metadata from headers
                     duration = float(response.headers.get("X-Duration", "0"))
                     sample_rate = int(response.headers.get("X-Sample-Rate", "22050"))
                     word_timings_str = response.headers.get("X-Word-Timings", "[]")
                     
-                    # Parse word timings
-                    import json
-                    try:
-                        word_timings = json.loads(word_timings_str.replace("'", '"'))
-                    except:
-                        word_timings = []
+                    word_timings = parse_word_timings(word_timings_str)
+                    
+                    if dest_path is not None:
+                        await _stream_to_file(response, dest_path)
+                    else:
+                        # Drain so the connection goes back to the pool
+                        async for _ in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                            pass
                     
                     return {
-                        "audio_data": response.content,
+                        "audio_path": dest_path,
                         "duration": duration,
                         "sample_rate": sample_rate,
                         "word_timings": word_timings,
                     }
-                elif response.status_code == 503:
-                    # Service unavailable - retry
-                    if attempt < max_retries - 1:
-                        logger.warning(
-                            "TTS service unavailable, retrying",
-                            attempt=attempt + 1,
-                            max_retries=max_retries,
-                        )
-                        await asyncio.sleep(retry_delay * (attempt + 1))
-                        continue
-                    raise Exception(f"TTS service unavailable after {max_retries} attempts: {response.text}")
-                else:
-                    raise Exception(f"TTS service error ({response.status_code}): {response.text}")
-                    
+                
+                # Error bodies are small; read them for the message
+                await response.aread()
+            
+            if response.status_code == 503:
+                # Service unavailable - retry
+                if attempt < max_retries - 1:
+                    logger.warning(
+                        "TTS service unavailable, retrying",
+                        attempt=attempt + 1,
+                        max_retries=max_retries,
+                    )
+                    await asyncio.sleep(retry_delay * (attempt + 1))
+                    continue
+                raise Exception(f"TTS service unavailable after {max_retries} attempts: {response.text}")
+            else:
+                raise Exception(f"TTS service error ({response.status_code}): {response.text}")
+        
         except httpx.TimeoutException:
             if attempt < max_retries - 1:
                 logger.warning(
@@ -211,7 +443,7 @@ async def call_tts_service(
                 await asyncio.sleep(retry_delay * (attempt + 1))
                 continue
             raise Exception(f"TTS service timeout after {max_retries} attempts")
-        except httpx.ConnectError as e:
+        except STALE_CONNECTION_ERRORS as e:
             if attempt < max_retries - 1:
                 logger.warning(
                     "TTS service connection error, retrying",
@@ -226,6 +458,53 @@ async def call_tts_service(
     raise Exception("TTS service call failed after all retries")
 
 
+def tts_cache_key(text: str, voice_id: str, language: str, speed: float) -> str:
+    """Content address of a TTS result: identical inputs produce identical audio."""
+    return hashlib.sha256(f"{text}|{voice_id}|{language}|{speed}".encode()).hexdigest()
+
+
+async def get_cached_tts(cache_key: str, dest_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetch a cached TTS result into dest_path.
+    
+    Returns the result metadata (duration, sample_rate, word_timings) on a hit,
+    or None on a miss or any storage error.
+    """
+    bucket = BUCKETS["tts_cache"]
+    try:
+        # The metadata sidecar is written last, so its presence means the audio is complete
+        meta = orjson.loads(await storage_client.download_file(bucket, f"{cache_key}.json"))
+        await storage_client.download_file(bucket, f"{cache_key}.wav", destination=dest_path)
+    except Exception:
+        return None
+    
+    return {**meta, "audio_path": dest_path}
+
+
+async def store_cached_tts(cache_key: str, audio_path: str, tts_result: Dict[str, Any]) -> None:
+    """Store a TTS result in the cache (best effort)."""
+    bucket = BUCKETS["tts_cache"]
+    try:
+        await storage_client.upload_file(
+            file_path=audio_path,
+            bucket=bucket,
+            key=f"{cache_key}.wav",
+            content_type="audio/wav",
+        )
+        await storage_client.upload_bytes(
+            orjson.dumps({
+                "duration": tts_result["duration"],
+                "sample_rate": tts_result["sample_rate"],
+                "word_timings": tts_result["word_timings"],
+            }),
+            bucket=bucket,
+            key=f"{cache_key}.json",
+            content_type="application/json",
+        )
+    except Exception as e:
+        logger.warning("Failed to cache TTS result", cache_key=cache_key, error=str(e))
+
+
 async def call_avatar_service(
     job_id: str,
     avatar_id: str,
@@ -245,59 +524,45 @@ async def call_avatar_service(
     
     for attempt in range(max_retries):
         try:
-            async with httpx.AsyncClient(timeout=600.0) as client:
-                # Check service health first
-                try:
-                    health_response = await client.get(f"{AVATAR_SERVICE_URL}/health", timeout=5.0)
-                    if health_response.status_code != 200:
-                        logger.warning(
-                            "Avatar service health check failed",
-                            status=health_response.status_code,
-                            attempt=attempt + 1,
-                        )
-                except Exception as e:
+            # No separate /health probe: a 503, timeout or connection error
+            # from the real request drives the retry loop below
+            response = await get_http_client().post(
+                f"{AVATAR_SERVICE_URL}/render",
+                json={
+                    "job_id": job_id,
+                    "avatar_id": avatar_id,
+                    "audio_url": audio_path,
+                    "word_timings": word_timings,
+                    "width": width,
+                    "height": height,
+                    "fps": fps,
+                    "emotion": emotion,
+                    "expression_scale": expression_scale,
+                    "head_pose_scale": head_pose_scale,
+                    "use_sadtalker": use_sadtalker,
+                },
+                timeout=600.0,
+            )
+            
+            if response.status_code == 200:
+                return response.json()
+            elif response.status_code == 503:
+                # Service unavailable - retry
+                if attempt < max_retries - 1:
                     logger.warning(
-                        "Avatar service health check error",
-                        error=str(e),
+                        "Avatar service unavailable, retrying",
                         attempt=attempt + 1,
+                        max_retries=max_retries,
                     )
-                
-                response = await client.post(
-                    f"{AVATAR_SERVICE_URL}/render",
-                    json={
-                        "job_id": job_id,
-                        "avatar_id": avatar_id,
-                        "audio_url": audio_path,
-                        "word_timings": word_timings,
-                        "width": width,
-                        "height": height,
-                        "fps": fps,
-                        "emotion": emotion,
-                        "expression_scale": expression_scale,
-                        "head_pose_scale": head_pose_scale,
-                        "use_sadtalker": use_sadtalker,
-                    },
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 503:
-                    # Service unavailable - retry
-                    if attempt < max_retries - 1:
-                        logger.warning(
-                            "Avatar service unavailable, retrying",
-                            attempt=attempt + 1,
-                            max_retries=max_retries,
-                        )
-                        await asyncio.sleep(retry_delay * (attempt + 1))
-                        continue
-                    raise Exception(f"Avatar service unavailable after {max_retries} attempts: {response.text}")
-                else:
-                    # Capture full error text
-                    error_text = response.text
-                    logger.error("Avatar service error", status=response.status_code, response=error_text)
-                    raise Exception(f"Avatar service error ({response.status_code}): {error_text}")
-                    
+                    await asyncio.sleep(retry_delay * (attempt + 1))
+                    continue
+                raise Exception(f"Avatar service unavailable after {max_retries} attempts: {response.text}")
+            else:
+                # Capture full error text
+                error_text = response.text
+                logger.error("Avatar service error", status=response.status_code, response=error_text)
+                raise Exception(f"Avatar service error ({response.status_code}): {error_text}")
+        
         except httpx.TimeoutException:
             if attempt < max_retries - 1:
                 logger.warning(
@@ -308,7 +573,7 @@ async def call_avatar_service(
                 await asyncio.sleep(retry_delay * (attempt + 1))
                 continue
             raise Exception(f"Avatar service timeout after {max_retries} attempts")
-        except httpx.ConnectError as e:
+        except STALE_CONNECTION_ERRORS as e:
             if attempt < max_retries - 1:
                 logger.warning(
                     "Avatar service connection error, retrying",
@@ -324,428 +589,630 @@ async def call_avatar_service(
 
 
 async def wait_for_render(job_id: str, timeout: int = 600) -> Dict[str, Any]:
-    """Wait for avatar render to complete."""
-    start_time = datetime.utcnow()
+    """
+    Wait for avatar render to complete.
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        while True:
-            elapsed = (datetime.utcnow() - start_time).total_seconds()
-            if elapsed > timeout:
-                raise Exception("Render timeout exceeded")
-            
-            response = await client.get(
-                f"{AVATAR_SERVICE_URL}/render/{job_id}/status"
-            )
-            
-            if response.status_code != 200:
-                raise Exception(f"Status check failed: {response.text}")
-            
-            status = response.json()
-            
-            if status["status"] == "completed":
-                return status
-            elif status["current_step"] == "Failed":
-                error_msg = status.get("error", "Unknown error")
-                logger.error("Render failed during wait", error=error_msg, job_id=job_id)
-                raise Exception(f"Render failed: {error_msg}")
-            
-            await asyncio.sleep(2)
+    Long-polls the status endpoint (?wait=), so the avatar service answers as
+    soon as the render finishes. Avatar services without long-poll support
+    answer immediately; those are polled with a backoff instead.
+    """
+    start = time.monotonic()
+    poll_delay = RENDER_POLL_INITIAL_DELAY
+    
+    client = get_http_client()
+    while True:
+        elapsed = time.monotonic() - start
+        if elapsed > timeout:
+            raise Exception("Render timeout exceeded")
+        
+        wait = min(RENDER_STATUS_WAIT, timeout - elapsed)
+        response = await client.get(
+            f"{AVATAR_SERVICE_URL}/render/{job_id}/status",
+            params={"wait": wait},
+            timeout=wait + 30.0,
+        )
+        
+        if response.status_code != 200:
+            raise Exception(f"Status check failed: {response.text}")
+        
+        status = response.json()
+        
+        if status["status"] == "completed":
+            return status
+        elif status["status"] == "failed" or status["current_step"] == "Failed":
+            error_msg = status.get("error") or "Unknown error"
+            logger.error("Render failed during wait", error=error_msg, job_id=job_id)
+            raise Exception(f"Render failed: {error_msg}")
+        
+        if not status.get("long_poll"):
+            # Jitter keeps workers that started together from polling in lockstep
+            await asyncio.sleep(poll_delay + random.uniform(0, poll_delay * 0.1))
+            poll_delay = min(poll_delay * 1.5, RENDER_POLL_MAX_DELAY)
+
 
+async def create_placeholder_video(
+    audio_path: Path,
+    video_path: Path,
+    width: int,
+    height: int,
+    duration: float,
+    timeout: float = 300,
+) -> None:
+    """
+    Render a black video carrying the narration audio (avatar fallback).
+    
+    ffmpeg runs as an asyncio subprocess, so the encode doesn't block the
+    worker's event loop; it is killed if it outlives the timeout.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        "ffmpeg",
+        "-f", "lavfi",
+        "-i", f"color=c=black:s={width}x{height}:d={duration}",
+        "-i", str(audio_path),
+        "-c:v", "libx264",
+        "-c:a", "aac",
+        "-shortest",
+        "-y",
+        str(video_path),
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        _, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    
+    if proc.returncode != 0:
+        raise RuntimeError(
+            f"ffmpeg exited with {proc.returncode}: {stderr.decode(errors='replace')[-500:]}"
+        )
 
-@celery_app.task(bind=True, max_retries=3)
-def video_generation_task(self, job_id: str) -> Dict[str, Any]:
+
+def _job_temp_dir(job_id: str) -> Tuple[Path, str]:
+    """
+    Get the job's temp directory and the audio path as the avatar service sees it.
+    
+    Stages of one job may run on different workers, so the directory lives on
+    the shared volume (/shared in docker-compose) when it is mounted.
+    """
+    shared_root = Path("/shared")
+    if shared_root.exists():
+        job_temp_dir = shared_root / "temp" / str(job_id)
+        audio_path_for_avatar = f"/shared/temp/{job_id}/audio.wav"
+    else:
+        # Fallback for local dev (no shared volume)
+        # Use a temp dir that hopefully works or is absolute
+        job_temp_dir = Path(tempfile.gettempdir()) / "neura_tasks" / str(job_id)
+        audio_path_for_avatar = str(job_temp_dir / "audio.wav")
+    
+    return job_temp_dir, audio_path_for_avatar
+
+
+def _cleanup_job_temp_dir(job_id: str) -> None:
+    """Remove the job's temp directory."""
+    job_temp_dir, _ = _job_temp_dir(job_id)
+    try:
+        if job_temp_dir.exists():
+            shutil.rmtree(job_temp_dir)
+            logger.info("Cleaned up temp directory", path=str(job_temp_dir))
+    except Exception as cleanup_error:
+        logger.warning("Failed to cleanup temp directory", error=str(cleanup_error))
+
+
+async def _load_job_video_user(db: AsyncSession, job_id: str) -> Tuple[Any, Any, Any]:
+    """
+    Load a job with its video and the video's owner in one round trip.
+    
+    Outer joins keep the job in the result when the video or user is missing,
+    so callers can still tell "job not found" from "video not found".
+    Returns (job, video, user); any of them may be None.
+    """
+    stmt = (
+        select(Job, Video, User)
+        .outerjoin(Video, Video.id == cast(Job.input_data["video_id"].as_string(), Uuid))
+        .outerjoin(User, User.id == Video.user_id)
+        .where(Job.id == UUID(job_id))
+    )
+    row = (await db.execute(stmt)).one_or_none()
+    if row is None:
+        return None, None, None
+    return row[0], row[1], row[2]
+
+
+async def _reserve_credits(db: AsyncSession, user_id: UUID, amount: int) -> Optional[int]:
+    """
+    Atomically deduct credits if the user has enough.
+    
+    Returns the new balance, or None when the balance is insufficient. The
+    check and the deduction are one UPDATE, so concurrent jobs can't overspend.
+    """
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id, User.credits >= amount)
+        .values(credits=User.credits - amount)
+        .returning(User.credits)
+    )
+    return result.scalar_one_or_none()
+
+
+async def _refund_credits(db: AsyncSession, user_id: UUID, amount: int) -> None:
+    """Give back credits reserved by _reserve_credits."""
+    await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(credits=User.credits + amount)
+    )
+
+
+# Transient failures worth retrying: HTTP transport errors (TTS/avatar
+# services), S3 connection errors, and lost or exhausted database
+# connections. Anything else (a missing job or video, insufficient credits,
+# an empty script) fails the same way every time, so it fails the job at once
+RETRYABLE_ERRORS = (
+    httpx.HTTPError,
+    *STALE_CONNECTION_ERRORS,
+    BotoConnectionError,
+    BotoHTTPClientError,
+    OperationalError,
+    PoolTimeoutError,
+)
+
+# Retry policy for tasks that call the TTS/avatar services: exponential
+# backoff from 60s up to 30 minutes with full jitter, so tasks that failed
+# during an outage don't all hit the recovering service at the same moment
+TASK_RETRY_BACKOFF = {
+    "autoretry_for": RETRYABLE_ERRORS,
+    "max_retries": 5,
+    "retry_backoff": 60,
+    "retry_backoff_max": 1800,
+    "retry_jitter": True,
+}
+
+
+@celery_app.task
+def video_generation_task(job_id: str) -> Dict[str, Any]:
     """
     Generate a video from script.
     
-    Pipeline:
-    1. Load script and avatar config
-    2. Generate audio via TTS service
-    3. Process lip sync with Avatar service
-    4. Render avatar video
-    5. Upload to storage
+    Pipeline (one Celery task per stage, chained):
+    1. video_tts_stage: load job, reserve credits, generate audio via TTS service
+    2. video_render_stage: lip sync + render with the Avatar service
+    3. video_upload_stage: upload to storage
+    4. video_finalize_stage: update records
+    
+    Each stage retries on its own and is routed to the queue that suits it;
+    video_pipeline_failed marks the job failed (refunding reserved credits)
+    once a stage gives up.
     """
     logger.info("Starting video generation", job_id=job_id)
     
+    pipeline = chain(
+        video_tts_stage.s(job_id),
+        video_render_stage.s(),
+        video_upload_stage.s(),
+        video_finalize_stage.s(),
+    )
+    pipeline.apply_async(link_error=video_pipeline_failed.s(job_id))
+    
+    return {"status": "queued", "job_id": job_id}
+
+
+@celery_app.task(**TASK_RETRY_BACKOFF)
+def video_tts_stage(job_id: str) -> Dict[str, Any]:
+    """Pipeline stage 1: start the job and generate the narration audio."""
+    
     async def process():
-        # Import inside function to avoid module-level async issues
-        from app.models.job import Job
-        from app.models.video import Video
-        from app.models.user import User
-        from app.utils.storage import storage_client
-        from sqlalchemy import select
+        # Intermediate progress goes to Redis; the DB is only committed when
+        # the job starts and when it completes or fails
+        job_progress = get_job_progress()
         
         # Use worker-safe DB that creates fresh engine for this event loop
         async with get_worker_db() as db:
-            # Get job
-            result = await db.execute(select(Job).where(Job.id == UUID(job_id)))
-            job = result.scalar_one_or_none()
+            # Get job, video and the user for credit deduction in one query
+            job, video, user = await _load_job_video_user(db, job_id)
             
             if not job:
                 raise ValueError(f"Job {job_id} not found")
             
+            video_id = job.input_data.get("video_id")
+            if not video:
+                raise ValueError(f"Video {video_id} not found")
+            
+            is_preview = job.input_data.get("preview", False)
+            estimated_credits = job.credits_estimated or 10
+            
+            # Reserve credits before any GPU work, in the same commit that
+            # claims the job; job.credits_used marks the reservation so a
+            # retried stage doesn't charge twice
+            reserved = False
+            if user and not is_preview and not job.credits_used:
+                if await _reserve_credits(db, user.id, estimated_credits) is None:
+                    raise ValueError(f"Insufficient credits. Required: {estimated_credits}, Available: {user.credits}")
+                job.credits_used = estimated_credits
+                reserved = True
+            
             # Update job status
             job.status = "processing"
             job.started_at = datetime.utcnow()
             job.current_step = "Initializing"
             await db.commit()
             
-            video = None
-            temp_dir = None
+            if reserved:
+                await get_user_cache().invalidate(user.id)
+                logger.info("Credits deducted", user_id=str(user.id), credits_used=estimated_credits)
+            
+            # Create temp directory in shared volume for communication with avatar service
+            job_temp_dir, audio_path_for_avatar = _job_temp_dir(job_id)
+            job_temp_dir.mkdir(parents=True, exist_ok=True)
+            audio_path = job_temp_dir / "audio.wav"
+            
+            logger.info("Using temp dir", path=str(job_temp_dir), audio_path_for_service=audio_path_for_avatar)
+            
+            # ========================================
+            # Step 1: Generate TTS Audio
+            # ========================================
+            await job_progress.publish(job.id, "Generating audio", 0.1)
+            
+            # Get script (allow override for preview)
+            script = job.input_data.get("script") or video.script
+            
+            logger.info("Starting video generation",
+                       video_id=video_id,
+                       is_preview=is_preview,
+                       script_length=len(script),
+                       script_preview=script[:100] if script else None)
+            
+            if not script or len(script.strip()) == 0:
+                raise ValueError("Script is empty or missing")
+            
+            # Detect emotion from script (for SadTalker)
+            emotion = job.input_data.get("emotion")  # User override
+            if not emotion and detect_emotion_from_text_async is None:
+                emotion = "neutral"
+            elif not emotion:
+                try:
+                    emotion = await detect_emotion_from_text_async(
+                        script, use_ml=settings.emotion_use_ml
+                    )
+                    logger.info("Auto-detected emotion", emotion=emotion, script_preview=script[:50])
+                except Exception as e:
+                    logger.warning("Emotion detection failed, using neutral", error=str(e))
+                    emotion = "neutral"
+            
+            logger.info("Calling TTS service", video_id=video_id, script_length=len(script))
             
             try:
-                # Get video
-                video_id = job.input_data.get("video_id")
-                result = await db.execute(select(Video).where(Video.id == UUID(video_id)))
-                video = result.scalar_one_or_none()
-                
-                if not video:
-                    raise ValueError(f"Video {video_id} not found")
+                cleaned_script = clean_text_for_tts(script)
+                logger.info("Cleaned script for TTS",
+                           original_length=len(script),
+                           cleaned_length=len(cleaned_script),
+                           cleaned_preview=cleaned_script[:100])
                 
-                # Get user for credit deduction
-                result = await db.execute(select(User).where(User.id == video.user_id))
-                user = result.scalar_one_or_none()
+                voice_id = job.input_data.get("voice_id", "default")
+                cache_key = tts_cache_key(cleaned_script, voice_id, "en", 1.0)
+                tts_result = await get_cached_tts(cache_key, str(audio_path))
                 
-                # Check credits
-                estimated_credits = job.credits_estimated or 10
-                if user and user.credits < estimated_credits:
-                    raise ValueError(f"Insufficient credits. Required: {estimated_credits}, Available: {user.credits}")
-                
-                # Create temp directory in shared volume for communication with avatar service
-                # We added a shared volume at /shared in docker-compose
-                shared_root = Path("/shared")
-                if shared_root.exists():
-                    job_temp_dir = shared_root / "temp" / str(job_id)
-                    job_temp_dir.mkdir(parents=True, exist_ok=True)
-                    audio_path_for_avatar = f"/shared/temp/{job_id}/audio.wav"
+                if tts_result is not None:
+                    logger.info("TTS cache hit", cache_key=cache_key)
                 else:
-                    # Fallback for local dev (no shared volume)
-                    # Use a temp dir that hopefully works or is absolute
-                    job_temp_dir = Path(tempfile.gettempdir()) / "neura_tasks" / str(job_id)
-                    job_temp_dir.mkdir(parents=True, exist_ok=True)
-                    audio_path_for_avatar = str(job_temp_dir / "audio.wav")
-                
-                audio_path = job_temp_dir / "audio.wav"
-                video_path = job_temp_dir / "output.mp4"
-                
-                logger.info("Using temp dir", path=str(job_temp_dir), audio_path_for_service=audio_path_for_avatar)
-                
-                # ========================================
-                # Step 1: Generate TTS Audio
-                # ========================================
-                job.current_step = "Generating audio"
-                job.progress = 0.1
-                await db.commit()
-                
-                # Get script (allow override for preview)
-                script = job.input_data.get("script") or video.script
-                is_preview = job.input_data.get("preview", False)
-                
-                logger.info("Starting video generation", 
-                           video_id=video_id, 
-                           is_preview=is_preview,
-                           script_length=len(script),
-                           script_preview=script[:100] if script else None)
-                
-                if not script or len(script.strip()) == 0:
-                    raise ValueError("Script is empty or missing")
-                
-                # Detect emotion from script (for SadTalker)
-                emotion = job.input_data.get("emotion")  # User override
-                if not emotion:
-                    try:
-                        from app.utils.emotion import detect_emotion_from_text
-                        emotion = detect_emotion_from_text(script, use_ml=False)
-                        logger.info("Auto-detected emotion", emotion=emotion, script_preview=script[:50])
-                    except Exception as e:
-                        logger.warning("Emotion detection failed, using neutral", error=str(e))
-                        emotion = "neutral"
-                
-                logger.info("Calling TTS service", video_id=video_id, script_length=len(script))
-                
-                try:
-                    cleaned_script = clean_text_for_tts(script)
-                    logger.info("Cleaned script for TTS", 
-                               original_length=len(script),
-                               cleaned_length=len(cleaned_script),
-                               cleaned_preview=cleaned_script[:100])
-                    
                     tts_result = await call_tts_service(
                         text=cleaned_script,
-                        voice_id=job.input_data.get("voice_id", "default"),
+                        voice_id=voice_id,
                         language="en",
                         speed=1.0,
+                        dest_path=str(audio_path),
                     )
-                    
-                    # Save audio to temp file
-                    audio_path.write_bytes(tts_result["audio_data"])
-                    word_timings = tts_result["word_timings"]
-                    audio_duration = tts_result["duration"]
-                    
-                    logger.info("TTS completed", duration=audio_duration)
-                    
-                except Exception as e:
-                    logger.warning("TTS service unavailable, using fallback", error=str(e))
-                    # Fallback: create a simple silent audio file
-                    # Instead of importing services, create minimal audio
-                    import wave
-                    import struct
-                    sample_rate = 22050
-                    duration = len(script) / 15  # ~15 chars per second
-                    num_samples = int(sample_rate * duration)
-                    
-                    with wave.open(str(audio_path), 'wb') as wav_file:
-                        wav_file.setnchannels(1)  # Mono
-                        wav_file.setsampwidth(2)  # 16-bit
-                        wav_file.setframerate(sample_rate)
-                        # Write silent audio
-                        for _ in range(num_samples):
-                            wav_file.writeframes(struct.pack('<h', 0))
-                    
-                    # Create simple word timings
-                    words = script.split()
-                    word_duration = duration / len(words) if words else duration
-                    word_timings = []
-                    current_time = 0.0
-                    for word in words:
-                        word_timings.append({
-                            "word": word,
-                            "start": current_time,
-                            "end": current_time + word_duration
-                        })
-                        current_time += word_duration
-                    
-                    audio_duration = duration
-                    logger.info("Created fallback silent audio", duration=audio_duration)
-                
-                job.progress = 0.3
-                await db.commit()
-                
-                # ========================================
-                # Step 2: Render Avatar Video
-                # ========================================
-                job.current_step = "Rendering avatar"
-                job.progress = 0.4
-                await db.commit()
-                
-                # Get resolution (from job input_data for previews, or from video record)
-                resolution = job.input_data.get("resolution") or video.resolution or "1080p"
-                resolution_map = {
-                    "720p": (1280, 720),
-                    "1080p": (1920, 1080),
-                    "4k": (3840, 2160),
-                }
-                width, height = resolution_map.get(resolution, (1920, 1080))
-                
-                logger.info("Preparing avatar render", 
-                           video_id=video_id,
-                           avatar_id=video.avatar_id,
-                           resolution=resolution,
-                           width=width,
-                           height=height,
-                           audio_file_exists=audio_path.exists(),
-                           audio_file_size=audio_path.stat().st_size if audio_path.exists() else 0)
-                
-                try:
-                    # Start render job
-                    render_job_id = f"{job_id}_render"
-                    # Convert UUID to string - Prioritize job input (runtime selection) over video record
-                    job_avatar_id = job.input_data.get("avatar_id")
-                    avatar_id_str = job_avatar_id if job_avatar_id else (str(video.avatar_id) if video.avatar_id else "default")
-                    
-                    logger.info("Calling Avatar service", 
-                               render_job_id=render_job_id,
-                               avatar_id=avatar_id_str,
-                               audio_path_for_avatar=audio_path_for_avatar,
-                               emotion=emotion)
-                    
-                    await call_avatar_service(
-                        job_id=render_job_id,
-                        avatar_id=avatar_id_str,
-                        audio_path=audio_path_for_avatar,
-                        word_timings=word_timings,
-                        width=width,
-                        height=height,
-                        fps=30,
-                        emotion=emotion,
-                        expression_scale=job.input_data.get("expression_scale", 1.0),
-                        head_pose_scale=job.input_data.get("head_pose_scale", 1.0),
-                        use_sadtalker=job.input_data.get("use_sadtalker", True),
-                    )
-                    
-                    # Wait for render to complete
-                    job.current_step = "Processing frames"
-                    job.progress = 0.5
-                    await db.commit()
-                    
-                    render_status = await wait_for_render(render_job_id, timeout=600)
-                    
-                    # Download rendered video
-                    async with httpx.AsyncClient() as client:
-                        response = await client.get(
-                            f"{AVATAR_SERVICE_URL}/render/{render_job_id}/download"
-                        )
-                        video_path.write_bytes(response.content)
-                    
-                    logger.info("Avatar render completed")
-                    
-                except Exception as e:
-                    import traceback
-                    error_detail = traceback.format_exc()
-                    print(f"AVATAR SERVICE FAILED: {e}")
-                    print(error_detail)
-                    logger.error("Avatar service failed", error=str(e))
-                    logger.warning("Avatar service unavailable, using fallback", error=str(e))
-                    # Fallback: create a simple placeholder video using ffmpeg
-                    # Create a black video with the audio
-                    import subprocess
-                    try:
-                        subprocess.run(
-                            [
-                                "ffmpeg",
-                                "-f", "lavfi",
-                                "-i", f"color=c=black:s={width}x{height}:d={audio_duration}",
-                                "-i", str(audio_path),
-                                "-c:v", "libx264",
-                                "-c:a", "aac",
-                                "-shortest",
-                                "-y",
-                                str(video_path),
-                            ],
-                            check=True,
-                            capture_output=True,
-                            timeout=300,
-                        )
-                        logger.info("Created fallback placeholder video")
-                    except Exception as fallback_error:
-                        logger.error("Fallback video creation failed", error=str(fallback_error))
-                        # Create empty file as last resort
-                        video_path.write_bytes(b"")
-                
-                job.progress = 0.8
-                await db.commit()
-                
-                # ========================================
-                # Step 3: Upload to Storage
-                # ========================================
-                job.current_step = "Uploading"
-                job.progress = 0.9
-                await db.commit()
-                
-                logger.info("Uploading to storage", video_id=video_id)
+                    await store_cached_tts(cache_key, str(audio_path), tts_result)
                 
-                # Upload to MinIO/S3
-                video_key = f"videos/{video.user_id}/{video_id}.mp4"
-                video_url = await storage_client.upload_file(
-                    file_path=str(video_path),
-                    bucket="neura-videos",
-                    key=video_key,
-                )
-                
-                # Also upload audio
-                audio_key = f"audio/{video.user_id}/{video_id}.wav"
-                audio_url = await storage_client.upload_file(
-                    file_path=str(audio_path),
-                    bucket="neura-videos",
-                    key=audio_key,
-                )
+                word_timings = tts_result["word_timings"]
+                audio_duration = tts_result["duration"]
                 
-                logger.info("Upload completed", video_url=video_url)
+                logger.info("TTS completed", duration=audio_duration)
+            
+            except Exception as e:
+                logger.warning("TTS service unavailable, using fallback", error=str(e))
+                # Fallback: create a simple silent audio file
+                # Instead of importing services, create minimal audio
+                sample_rate = 22050
+                duration = len(script) / 15  # ~15 chars per second
+                num_samples = int(sample_rate * duration)
                 
-                # ========================================
-                # Step 4: Deduct Credits
-                # ========================================
-                # Check if this is a preview
-                is_preview = job.input_data.get("preview", False)
+                with wave.open(str(audio_path), 'wb') as wav_file:
+                    wav_file.setnchannels(1)  # Mono
+                    wav_file.setsampwidth(2)  # 16-bit
+                    wav_file.setframerate(sample_rate)
+                    # Write silent audio in one call
+                    wav_file.writeframes(np.zeros(num_samples, dtype="<i2").tobytes())
                 
-                if user and not is_preview:
-                    credits_used = estimated_credits
-                    user.credits -= credits_used
-                    logger.info("Credits deducted", user_id=str(user.id), credits_used=credits_used)
+                # Create simple word timings (evenly spaced boundaries)
+                words = script.split()
+                bounds = np.linspace(0.0, duration, len(words) + 1).tolist()
+                word_timings = [
+                    {"word": word, "start": start, "end": end}
+                    for word, start, end in zip(words, bounds, bounds[1:])
+                ]
                 
-                # ========================================
-                # Step 5: Update Records
-                # ========================================
-                if is_preview:
-                    # For preview, only update preview_url, don't change main video status
-                    video.preview_url = video_url
-                    logger.info("Preview video generated", preview_url=video_url)
-                else:
-                    # For full video, update all fields
-                    video.status = "completed"
-                    video.video_url = video_url
-                    video.audio_url = audio_url
-                    video.duration = audio_duration
-                    video.completed_at = datetime.utcnow()
-                    video.video_metadata = {
-                    "width": width,
-                    "height": height,
-                    "fps": 30,
+                audio_duration = duration
+                logger.info("Created fallback silent audio", duration=audio_duration)
+            
+            await job_progress.publish(job.id, "Generating audio", 0.3)
+            
+            return {
+                "job_id": job_id,
+                "video_id": video_id,
+                "user_id": str(video.user_id),
+                "is_preview": is_preview,
+                "estimated_credits": estimated_credits,
+                "emotion": emotion,
+                "word_timings": word_timings,
+                "audio_duration": audio_duration,
+            }
+    
+    return run_async(process())
+
+
+@celery_app.task(**TASK_RETRY_BACKOFF)
+def video_render_stage(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Pipeline stage 2: lip sync and render the avatar video."""
+    job_id = state["job_id"]
+    
+    async def process():
+        job_progress = get_job_progress()
+        
+        async with get_worker_db() as db:
+            job, video, _ = await _load_job_video_user(db, job_id)
+        
+        if not job:
+            raise ValueError(f"Job {job_id} not found")
+        if not video:
+            raise ValueError(f"Video {state['video_id']} not found")
+        
+        job_temp_dir, audio_path_for_avatar = _job_temp_dir(job_id)
+        audio_path = job_temp_dir / "audio.wav"
+        video_path = job_temp_dir / "output.mp4"
+        audio_duration = state["audio_duration"]
+        
+        # ========================================
+        # Step 2: Render Avatar Video
+        # ========================================
+        await job_progress.publish(job.id, "Rendering avatar", 0.4)
+        
+        # Get resolution (from job input_data for previews, or from video record)
+        resolution = job.input_data.get("resolution") or video.resolution or "1080p"
+        width, height = RESOLUTION_MAP.get(resolution, (1920, 1080))
+        
+        logger.info("Preparing avatar render",
+                   video_id=state["video_id"],
+                   avatar_id=video.avatar_id,
+                   resolution=resolution,
+                   width=width,
+                   height=height,
+                   audio_file_exists=audio_path.exists(),
+                   audio_file_size=audio_path.stat().st_size if audio_path.exists() else 0)
+        
+        try:
+            # Start render job
+            render_job_id = f"{job_id}_render"
+            # Convert UUID to string - Prioritize job input (runtime selection) over video record
+            job_avatar_id = job.input_data.get("avatar_id")
+            avatar_id_str = job_avatar_id if job_avatar_id else (str(video.avatar_id) if video.avatar_id else "default")
+            
+            logger.info("Calling Avatar service",
+                       render_job_id=render_job_id,
+                       avatar_id=avatar_id_str,
+                       audio_path_for_avatar=audio_path_for_avatar,
+                       emotion=state["emotion"])
+            
+            await call_avatar_service(
+                job_id=render_job_id,
+                avatar_id=avatar_id_str,
+                audio_path=audio_path_for_avatar,
+                word_timings=state["word_timings"],
+                width=width,
+                height=height,
+                fps=30,
+                emotion=state["emotion"],
+                expression_scale=job.input_data.get("expression_scale", 1.0),
+                head_pose_scale=job.input_data.get("head_pose_scale", 1.0),
+                use_sadtalker=job.input_data.get("use_sadtalker", True),
+            )
+            
+            # Wait for render to complete
+            await job_progress.publish(job.id, "Processing frames", 0.5)
+            
+            render_status = await wait_for_render(render_job_id, timeout=600)
+            
+            # Download rendered video
+            async with get_http_client().stream(
+                "GET", f"{AVATAR_SERVICE_URL}/render/{render_job_id}/download"
+            ) as response:
+                # An error body must not end up saved as the MP4
+                response.raise_for_status()
+                await _stream_to_file(response, str(video_path))
+            
+            logger.info("Avatar render completed")
+        
+        except Exception as e:
+            logger.exception("avatar_service_failed", job_id=job_id)
+            logger.warning("Avatar service unavailable, using fallback", error=str(e))
+            # Fallback: create a simple placeholder video using ffmpeg
+            # Create a black video with the audio
+            try:
+                await create_placeholder_video(audio_path, video_path, width, height, audio_duration)
+                logger.info("Created fallback placeholder video")
+            except Exception as fallback_error:
+                logger.error("Fallback video creation failed", error=str(fallback_error))
+                # Create empty file as last resort
+                video_path.write_bytes(b"")
+        
+        await job_progress.publish(job.id, "Processing frames", 0.8)
+        
+        return {**state, "width": width, "height": height}
+    
+    return run_async(process())
+
+
+@celery_app.task(**TASK_RETRY_BACKOFF)
+def video_upload_stage(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Pipeline stage 3: upload the video and audio to storage."""
+    job_id = state["job_id"]
+    video_id = state["video_id"]
+    
+    async def process():
+        job_temp_dir, _ = _job_temp_dir(job_id)
+        
+        # ========================================
+        # Step 3: Upload to Storage
+        # ========================================
+        await get_job_progress().publish(UUID(job_id), "Uploading", 0.9)
+        
+        logger.info("Uploading to storage", video_id=video_id)
+        
+        # Upload video and audio to MinIO/S3 concurrently (large files already
+        # go up as parallel multipart chunks via the storage TransferConfig)
+        video_key = f"videos/{state['user_id']}/{video_id}.mp4"
+        audio_key = f"audio/{state['user_id']}/{video_id}.wav"
+        video_url, audio_url = await asyncio.gather(
+            storage_client.upload_file(
+                file_path=str(job_temp_dir / "output.mp4"),
+                bucket="neura-videos",
+                key=video_key,
+            ),
+            storage_client.upload_file(
+                file_path=str(job_temp_dir / "audio.wav"),
+                bucket="neura-videos",
+                key=audio_key,
+            ),
+        )
+        
+        logger.info("Upload completed", video_url=video_url)
+        
+        return {**state, "video_url": video_url, "audio_url": audio_url}
+    
+    return run_async(process())
+
+
+@celery_app.task(**TASK_RETRY_BACKOFF)
+def video_finalize_stage(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Pipeline stage 4: record the results (credits were reserved in stage 1)."""
+    job_id = state["job_id"]
+    video_id = state["video_id"]
+    
+    async def process():
+        is_preview = state["is_preview"]
+        estimated_credits = state["estimated_credits"]
+        video_url = state["video_url"]
+        audio_url = state["audio_url"]
+        audio_duration = state["audio_duration"]
+        
+        async with get_worker_db() as db:
+            job, video, _ = await _load_job_video_user(db, job_id)
+            
+            if not job:
+                raise ValueError(f"Job {job_id} not found")
+            if not video:
+                raise ValueError(f"Video {video_id} not found")
+            
+            # ========================================
+            # Step 4: Update Records
+            # ========================================
+            # One timestamp for the video and job rows (naive UTC, like the
+            # columns)
+            now = datetime.utcnow()
+            
+            if is_preview:
+                # For preview, only update preview_url, don't change main video status
+                video.preview_url = video_url
+                logger.info("Preview video generated", preview_url=video_url)
+            else:
+                # For full video, update all fields
+                video.status = "completed"
+                video.video_url = video_url
+                video.audio_url = audio_url
+                video.duration = audio_duration
+                video.completed_at = now
+                video.video_metadata = {
+                "width": state["width"],
+                "height": state["height"],
+                "fps": 30,
+                "duration": audio_duration,
+                "word_timings": state["word_timings"],
+            }
+            
+            job.status = "completed"
+            job.progress = 1.0
+            job.current_step = "Complete"
+            job.completed_at = now
+            
+            # Set job result with appropriate URL based on preview status
+            if is_preview:
+                job.result = {
+                    "video_url": video_url,  # Frontend expects this field
+                    "preview_url": video_url,
+                    "audio_url": audio_url,
                     "duration": audio_duration,
-                    "word_timings": word_timings,
                 }
+            else:
+                job.result = {
+                    "video_url": video_url,
+                    "audio_url": audio_url,
+                    "duration": audio_duration,
+                }
+            
+            job.credits_used = estimated_credits if not is_preview else 0
+            
+            await db.commit()
+        
+        _cleanup_job_temp_dir(job_id)
+        
+        logger.info("Video generation completed", job_id=job_id, video_id=video_id, is_preview=is_preview)
+        return {"status": "completed", "video_url": video_url}
+    
+    return run_async(process())
+
+
+@celery_app.task
+def video_pipeline_failed(request, exc, traceback, job_id: str) -> None:
+    """Errback for the video pipeline: mark the job and video failed."""
+    
+    async def process():
+        refunded_user_id = None
+        async with get_worker_db() as db:
+            job, video, _ = await _load_job_video_user(db, job_id)
+            if not job:
+                return
+            
+            # Update job with error
+            job.status = "failed"
+            job.error = str(exc)
+            job.completed_at = datetime.utcnow()
+            
+            # Update video
+            if video:
+                video.status = "failed"
+                video.error_message = str(exc)
                 
-                job.status = "completed"
-                job.progress = 1.0
-                job.current_step = "Complete"
-                job.completed_at = datetime.utcnow()
-                
-                # Set job result with appropriate URL based on preview status
-                if is_preview:
-                    job.result = {
-                        "video_url": video_url,  # Frontend expects this field
-                        "preview_url": video_url,
-                        "audio_url": audio_url,
-                        "duration": audio_duration,
-                    }
-                else:
-                    job.result = {
-                        "video_url": video_url,
-                        "audio_url": audio_url,
-                        "duration": audio_duration,
-                    }
-                
-                job.credits_used = estimated_credits if not is_preview else 0
-                
-                await db.commit()
-                
-                logger.info("Video generation completed", job_id=job_id, video_id=video_id, is_preview=is_preview)
-                return {"status": "completed", "video_url": video_url}
-                
-            except Exception as e:
-                # Update job with error
-                job.status = "failed"
-                job.error = str(e)
-                job.completed_at = datetime.utcnow()
-                
-                # Update video
-                if video:
-                    video.status = "failed"
-                    video.error_message = str(e)
-                
-                await db.commit()
-                
-                logger.error("Video generation failed", job_id=job_id, error=str(e))
-                raise
-                
-            finally:
-                # Cleanup temp directory
-                try:
-                    if 'job_temp_dir' in locals() and job_temp_dir.exists():
-                        import shutil
-                        shutil.rmtree(job_temp_dir)
-                        logger.info("Cleaned up temp directory", path=str(job_temp_dir))
-                except Exception as cleanup_error:
-                    logger.warning("Failed to cleanup temp directory", error=str(cleanup_error))
+                # Refund credits reserved by the TTS stage
+                if job.credits_used:
+                    await _refund_credits(db, video.user_id, job.credits_used)
+                    logger.info("Credits refunded", user_id=str(video.user_id), credits=job.credits_used)
+                    job.credits_used = 0
+                    refunded_user_id = video.user_id
+            
+            await db.commit()
+        
+        if refunded_user_id is not None:
+            await get_user_cache().invalidate(refunded_user_id)
     
-    try:
-        return run_async(process())
-    except Exception as e:
-        # Retry on failure
-        raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
+    logger.error("Video generation failed", job_id=job_id, error=str(exc))
+    run_async(process())
+    _cleanup_job_temp_dir(job_id)
 
 
-@celery_app.task(bind=True, max_retries=3)
-def tts_generation_task(self, text: str, voice_id: str = None) -> Dict[str, Any]:
+@celery_app.task(**TASK_RETRY_BACKOFF)
+def tts_generation_task(text: str, voice_id: str = None) -> Dict[str, Any]:
     """Generate TTS audio standalone task."""
     logger.info("Starting TTS generation", text_length=len(text))
     
@@ -762,9 +1229,7 @@ def tts_generation_task(self, text: str, voice_id: str = None) -> Dict[str, Any]
             }
         except Exception as e:
             # Fallback to local TTS
-            from services.tts.engine import TTSEngine
-            engine = TTSEngine()
-            await engine.initialize()
+            engine = await _get_fallback_tts_engine()
             result = await engine.synthesize(text)
             return {
                 "status": "completed",
@@ -785,9 +1250,6 @@ def cleanup_expired_sessions():
     
     async def cleanup():
         # Use worker-safe DB to avoid loop mismatch
-        from app.models.user import Session
-        from sqlalchemy import delete
-        
         async with get_worker_db() as db:
             # Delete expired sessions
             result = await db.execute(
@@ -802,6 +1264,10 @@ def cleanup_expired_sessions():
     return run_async(cleanup())
 
 
+# Max stuck jobs re-queued per process_pending_jobs run
+PENDING_JOBS_BATCH_SIZE = 500
+
+
 @celery_app.task
 def process_pending_jobs():
     """Process any stuck pending jobs."""
@@ -809,59 +1275,87 @@ def process_pending_jobs():
     
     async def process():
         # Use worker-safe DB to avoid loop mismatch
-        from app.models.job import Job
-        from sqlalchemy import select
-        
         async with get_worker_db() as db:
-            # Find stuck jobs (pending for more than 5 minutes)
+            # Claim a batch of stuck jobs (pending for more than 5 minutes) and
+            # flip them in one statement; SKIP LOCKED lets concurrent beat runs
+            # or replicas claim disjoint batches instead of blocking
             cutoff = datetime.utcnow() - timedelta(minutes=5)
-            result = await db.execute(
-                select(Job).where(
+            claimed = (
+                select(Job.id)
+                .where(
                     Job.status == "pending",
                     Job.created_at < cutoff,
+                    Job.type == "video_generation",
                 )
+                .order_by(Job.created_at)
+                .limit(PENDING_JOBS_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
             )
-            stuck_jobs = result.scalars().all()
-            
-            for job in stuck_jobs:
-                # Re-queue the job
-                if job.type == "video_generation":
-                    video_generation_task.delay(str(job.id))
-                    job.status = "queued"
-            
+            result = await db.execute(
+                update(Job)
+                .where(Job.id.in_(claimed))
+                .values(status="queued")
+                .returning(Job.id)
+            )
+            job_ids = result.scalars().all()
             await db.commit()
             
-            logger.info("Re-queued stuck jobs", count=len(stuck_jobs))
-            return len(stuck_jobs)
+            # Re-queue the jobs in a single broker round-trip
+            if job_ids:
+                group(video_generation_task.s(str(job_id)) for job_id in job_ids).apply_async()
+            
+            logger.info("Re-queued stuck jobs", count=len(job_ids))
+            return len(job_ids)
     
     return run_async(process())
 
 
+def _clean_temp_dir(temp_dir: str, cutoff_ns: int) -> int:
+    """Remove entries of temp_dir last modified before cutoff_ns; returns the count."""
+    cleaned = 0
+    try:
+        entries = os.scandir(temp_dir)
+    except OSError:
+        return 0
+    
+    # One scandir pass; symlinks are removed themselves, never followed
+    with entries:
+        for entry in entries:
+            try:
+                if entry.stat(follow_symlinks=False).st_mtime_ns >= cutoff_ns:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+                cleaned += 1
+            except OSError:
+                pass
+    
+    return cleaned
+
+
 @celery_app.task
 def cleanup_old_temp_files():
     """Clean up old temporary files."""
     logger.info("Cleaning up old temp files")
     
-    temp_dirs = ["/tmp", "/app/temp"]
-    cutoff = datetime.utcnow() - timedelta(hours=24)
-    cleaned = 0
+    # /shared/temp holds job dirs left by crashed workers (RAM-backed in prod)
+    temp_dirs = ["/tmp", "/app/temp", "/shared/temp"]
+    cutoff_ns = time.time_ns() - 24 * 3600 * 10**9
     
-    for temp_dir in temp_dirs:
-        temp_path = Path(temp_dir)
-        if not temp_path.exists():
-            continue
-            
-        for item in temp_path.iterdir():
-            try:
-                if item.stat().st_mtime < cutoff.timestamp():
-                    if item.is_dir():
-                        import shutil
-                        shutil.rmtree(item)
-                    else:
-                        item.unlink()
-                    cleaned += 1
-            except:
-                pass
+    # Only roots that exist, each real directory once (e.g. /app/temp may be
+    # a symlink to /tmp)
+    roots = list(dict.fromkeys(
+        os.path.realpath(temp_dir) for temp_dir in temp_dirs if os.path.isdir(temp_dir)
+    ))
+    if len(roots) <= 1:
+        cleaned = sum(_clean_temp_dir(root, cutoff_ns) for root in roots)
+    else:
+        # Walk the roots concurrently (stat/unlink release the GIL)
+        with ThreadPoolExecutor(max_workers=len(roots)) as executor:
+            cleaned = sum(executor.map(lambda root: _clean_temp_dir(root, cutoff_ns), roots))
     
     logger.info("Cleaned up temp files", count=cleaned)
     return cleaned
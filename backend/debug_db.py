@@ -8,17 +8,20 @@ from sqlalchemy import select
 async def main():
     await init_db()
     
-    async with async_session_maker() as session:
+    # Separate sessions so both queries are in flight at once (a session
+    # runs one statement at a time); rows are streamed, not loaded up front
+    async with async_session_maker() as user_session, async_session_maker() as avatar_session:
+        users, avatars = await asyncio.gather(
+            user_session.stream(select(User)),
+            avatar_session.stream(select(Avatar)),
+        )
+        
         print("\n=== USERS ===")
-        result = await session.execute(select(User))
-        users = result.scalars().all()
-        for u in users:
+        async for u in users.scalars():
             print(f"User: {u.id} | {u.email} | Credits: {u.credits}")
 
         print("\n=== AVATARS ===")
-        result = await session.execute(select(Avatar))
-        avatars = result.scalars().all()
-        for a in avatars:
+        async for a in avatars.scalars():
             print(f"Avatar: {a.id} | {a.name} | Owner: {a.user_id} | Public: {a.is_public} | Default: {a.is_default}")
 
 if __name__ == "__main__":
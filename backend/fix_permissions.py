@@ -2,6 +2,7 @@ import boto3
 import json
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from botocore.client import Config
 
 logging.basicConfig(level=logging.INFO)
@@ -23,6 +24,11 @@ BUCKETS_MAP = {
     "thumbnails": "neura-thumbnails"
 }
 
+# ACL puts are independent round trips, so fan them out; the client's
+# connection pool must be at least as large as the worker count
+ACL_WORKERS = 32
+MAX_POOL_CONNECTIONS = 64
+
 def get_working_client():
     for endpoint in ENDPOINTS:
         try:
@@ -33,7 +39,8 @@ def get_working_client():
                 aws_access_key_id=ACCESS_KEY,
                 aws_secret_access_key=SECRET_KEY,
                 region_name=REGION,
-                config=Config(signature_version="s3v4", connect_timeout=2, read_timeout=2)
+                config=Config(signature_version="s3v4", connect_timeout=2, read_timeout=2,
+                              max_pool_connections=MAX_POOL_CONNECTIONS)
             )
             # Test connection
             client.list_buckets()
@@ -43,6 +50,14 @@ def get_working_client():
             logger.warning(f"Failed to connect to {endpoint}: {e}")
     return None
 
+def set_public_read(s3, bucket_name, key):
+    try:
+        s3.put_object_acl(Bucket=bucket_name, Key=key, ACL="public-read")
+        return True
+    except Exception as e:
+        logger.error(f"  ❌ ACL update failed for {key}: {e}")
+        return False
+
 def fix_permissions():
     s3 = get_working_client()
     if not s3:
@@ -68,18 +83,17 @@ def fix_permissions():
         except Exception as e:
             logger.error(f"  ❌ Policy update failed: {e}")
 
-        # 2. Object ACLs
+        # 2. Object ACLs (every page, not just the first 1000 keys; ACL puts
+        # for one page run while the next page is listed)
         try:
-            objects = s3.list_objects_v2(Bucket=bucket_name)
-            if "Contents" in objects:
-                count = 0
-                for obj in objects["Contents"]:
-                    key = obj["Key"]
-                    try:
-                        s3.put_object_acl(Bucket=bucket_name, Key=key, ACL="public-read")
-                        count += 1
-                    except Exception as e:
-                        logger.error(f"  ❌ ACL update failed for {key}: {e}")
+            futures = []
+            with ThreadPoolExecutor(max_workers=ACL_WORKERS) as executor:
+                paginator = s3.get_paginator("list_objects_v2")
+                for page in paginator.paginate(Bucket=bucket_name):
+                    for obj in page.get("Contents", []):
+                        futures.append(executor.submit(set_public_read, s3, bucket_name, obj["Key"]))
+            if futures:
+                count = sum(future.result() for future in futures)
                 logger.info(f"  ✅ ACL updated for {count} objects.")
             else:
                 logger.info("  (Bucket is empty)")
@@ -3,7 +3,7 @@ import asyncio
 from app.database import init_db, async_session_maker
 from app.models.voice import VoiceProfile
 from app.models.avatar import Avatar
-from sqlalchemy import select
+from sqlalchemy import insert, select
 
 DEFAULT_VOICES = [
     {
@@ -112,56 +112,54 @@ async def seed_voices():
     await init_db()
     
     async with async_session_maker() as session:
-        # Check existing voices
-        result = await session.execute(select(VoiceProfile).where(VoiceProfile.is_public == True))
-        existing = result.scalars().all()
-        existing_names = {v.name for v in existing}
+        # Check existing voices (names only, no ORM instances)
+        result = await session.scalars(select(VoiceProfile.name).where(VoiceProfile.is_public == True))
+        existing_names = set(result)
         
-        added = 0
-        for voice_data in DEFAULT_VOICES:
-            if voice_data["name"] not in existing_names:
-                voice = VoiceProfile(
-                    user_id=None,  # System voice
-                    **voice_data
-                )
-                session.add(voice)
-                added += 1
-                print(f"  + Added voice: {voice_data['name']}")
+        # Insert all missing voices in one bulk INSERT
+        to_add = [
+            {**voice_data, "user_id": None}  # System voice
+            for voice_data in DEFAULT_VOICES
+            if voice_data["name"] not in existing_names
+        ]
+        added = len(to_add)
         
         if added > 0:
+            await session.execute(insert(VoiceProfile), to_add)
             await session.commit()
+            for voice_data in to_add:
+                print(f"  + Added voice: {voice_data['name']}")
             print(f"\n✓ Added {added} new voices")
         else:
             print("✓ All default voices already exist")
 
 async def seed_avatars():
     """Seed default avatars into the database."""
-    async with async_session_maker() as session:
-        # Check existing avatars
-        result = await session.execute(select(Avatar).where(Avatar.is_public == True))
-        existing = result.scalars().all()
-        existing_names = {a.name for a in existing}
-        
-        # Get default voice for linking
-        result = await session.execute(
-            select(VoiceProfile).where(VoiceProfile.is_default == True, VoiceProfile.is_public == True)
+    # Separate sessions so both lookups are in flight at once (a session runs
+    # one statement at a time)
+    async with async_session_maker() as session, async_session_maker() as voice_session:
+        # Check existing avatars and get the default voice for linking
+        avatar_names, voice_id = await asyncio.gather(
+            session.scalars(select(Avatar.name).where(Avatar.is_public == True)),
+            voice_session.scalar(
+                select(VoiceProfile.id).where(VoiceProfile.is_default == True, VoiceProfile.is_public == True)
+            ),
         )
-        default_voice = result.scalar_one_or_none()
+        existing_names = set(avatar_names)
         
-        added = 0
-        for avatar_data in DEFAULT_AVATARS:
-            if avatar_data["name"] not in existing_names:
-                avatar = Avatar(
-                    user_id=None,  # System avatar
-                    voice_id=default_voice.id if default_voice else None,
-                    **avatar_data
-                )
-                session.add(avatar)
-                added += 1
-                print(f"  + Added avatar: {avatar_data['name']}")
+        # Insert all missing avatars in one bulk INSERT
+        to_add = [
+            {**avatar_data, "user_id": None, "voice_id": voice_id}  # System avatar
+            for avatar_data in DEFAULT_AVATARS
+            if avatar_data["name"] not in existing_names
+        ]
+        added = len(to_add)
         
         if added > 0:
+            await session.execute(insert(Avatar), to_add)
             await session.commit()
+            for avatar_data in to_add:
+                print(f"  + Added avatar: {avatar_data['name']}")
             print(f"\n✓ Added {added} new avatars")
         else:
             print("✓ All default avatars already exist")
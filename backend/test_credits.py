@@ -0,0 +1,112 @@
+"""Tests for CreditManager.try_deduct (atomic check-and-deduct)."""
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql
+
+from app.models.user import User
+from app.utils.credits import CreditManager
+
+
+class _Result:
+    def __init__(self, value):
+        self._value = value
+
+    def scalar_one_or_none(self):
+        return self._value
+
+
+class _RecordingSession:
+    """Stand-in AsyncSession that records statements and returns a fixed balance."""
+
+    def __init__(self, new_balance):
+        self.new_balance = new_balance
+        self.statements = []
+        self.info = {}
+
+    async def execute(self, statement, params=None):
+        self.statements.append(statement)
+        return _Result(self.new_balance)
+
+
+@pytest.mark.asyncio
+async def test_try_deduct_guards_balance_in_the_update():
+    db = _RecordingSession(new_balance=5)
+
+    await CreditManager(db).try_deduct(uuid.uuid4(), 5, "test")
+
+    assert len(db.statements) == 1
+    sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("UPDATE users SET credits=(users.credits - ")
+    assert "users.credits >= " in sql
+    assert "RETURNING users.credits" in sql
+
+
+@pytest.mark.asyncio
+async def test_try_deduct_success_returns_balance_and_defers_invalidation():
+    db = _RecordingSession(new_balance=5)
+
+    assert await CreditManager(db).try_deduct(uuid.uuid4(), 5, "test") == (True, 5)
+    # The cached user is only dropped once the caller commits
+    assert len(db.info["after_commit"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_try_deduct_insufficient_credits_changes_nothing():
+    # No row matched "credits >= amount"
+    db = _RecordingSession(new_balance=None)
+
+    assert await CreditManager(db).try_deduct(uuid.uuid4(), 5, "test") == (False, None)
+    assert "after_commit" not in db.info
+
+
+@pytest.mark.asyncio
+async def test_deduct_credits_reports_try_deduct_outcome():
+    assert await CreditManager(_RecordingSession(new_balance=0)).deduct_credits(uuid.uuid4(), 5, "test")
+    assert not await CreditManager(_RecordingSession(new_balance=None)).deduct_credits(uuid.uuid4(), 5, "test")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_deductions_never_overdraw():
+    """Racing deductions against a real database: the balance floor holds."""
+    from app.database import async_session_maker, engine
+
+    try:
+        async with engine.connect():
+            pass
+    except Exception as e:
+        await engine.dispose()
+        pytest.skip(f"database not available: {e}")
+
+    async with async_session_maker() as db:
+        user = User(
+            email=f"credits_race_{uuid.uuid4().hex[:8]}@neura.ai",
+            password_hash="x",
+            name="Credits Race",
+            credits=10,
+        )
+        db.add(user)
+        await db.commit()
+        user_id = user.id
+
+    async def deduct() -> bool:
+        async with async_session_maker() as db:
+            success, _ = await CreditManager(db).try_deduct(user_id, 4, "race test")
+            await db.commit()
+            return success
+
+    try:
+        results = await asyncio.gather(*(deduct() for _ in range(5)))
+
+        async with async_session_maker() as db:
+            balance = await db.scalar(select(User.credits).where(User.id == user_id))
+
+        assert results.count(True) == 2
+        assert balance == 2
+    finally:
+        async with async_session_maker() as db:
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+        await engine.dispose()
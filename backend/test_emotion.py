@@ -0,0 +1,149 @@
+"""Tests for emotion detection: ML micro-batching and keyword scoring."""
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.utils import emotion
+from app.utils.emotion import EmotionBatcher, detect_emotion_from_text_async
+
+LABELS = ["happy", "sad", "angry", "surprised", "neutral"]
+
+
+@pytest.fixture
+def classify_calls(monkeypatch):
+    """Replace the model with one that labels "text <n> ..." as LABELS[n % 5]."""
+    calls = []
+
+    def fake_classify_batch(texts):
+        calls.append(list(texts))
+        return [LABELS[int(text.split()[1]) % len(LABELS)] for text in texts]
+
+    monkeypatch.setattr(emotion, "_classify_batch", fake_classify_batch)
+    emotion._emotion_cache.clear()
+    monkeypatch.setattr(emotion, "_last_result", None)
+    return calls
+
+
+def _text(n: int) -> str:
+    return f"text {n} for the emotion classifier"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submissions_share_one_model_call(classify_calls):
+    batcher = EmotionBatcher(max_batch=16, max_wait_ms=50)
+
+    results = await asyncio.gather(*(batcher.submit(_text(n)) for n in range(10)))
+
+    assert len(classify_calls) == 1
+    assert sorted(classify_calls[0]) == sorted(_text(n) for n in range(10))
+    # Each caller gets the label for its own text
+    assert results == [LABELS[n % len(LABELS)] for n in range(10)]
+
+
+@pytest.mark.asyncio
+async def test_batches_are_capped_at_max_batch(classify_calls):
+    batcher = EmotionBatcher(max_batch=4, max_wait_ms=50)
+
+    results = await asyncio.gather(*(batcher.submit(_text(n)) for n in range(10)))
+
+    assert [len(batch) for batch in classify_calls] == [4, 4, 2]
+    assert results == [LABELS[n % len(LABELS)] for n in range(10)]
+
+
+@pytest.mark.asyncio
+async def test_model_errors_reach_every_caller_in_the_batch(monkeypatch):
+    def failing_classify_batch(texts):
+        raise RuntimeError("model exploded")
+
+    monkeypatch.setattr(emotion, "_classify_batch", failing_classify_batch)
+    batcher = EmotionBatcher(max_batch=16, max_wait_ms=50)
+
+    results = await asyncio.gather(
+        *(batcher.submit(_text(n)) for n in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(r, RuntimeError) and str(r) == "model exploded" for r in results)
+
+
+@pytest.mark.asyncio
+async def test_batcher_keeps_serving_after_a_failed_batch(monkeypatch, classify_calls):
+    fake_classify_batch = emotion._classify_batch
+    failures = [RuntimeError("transient")]
+
+    def flaky_classify_batch(texts):
+        if failures:
+            raise failures.pop()
+        return fake_classify_batch(texts)
+
+    monkeypatch.setattr(emotion, "_classify_batch", flaky_classify_batch)
+    batcher = EmotionBatcher(max_batch=16, max_wait_ms=10)
+
+    with pytest.raises(RuntimeError):
+        await batcher.submit(_text(0))
+    assert await batcher.submit(_text(1)) == LABELS[1]
+
+
+@pytest.mark.asyncio
+async def test_ml_detection_is_batched_across_callers(classify_calls):
+    results = await asyncio.gather(
+        *(detect_emotion_from_text_async(_text(n), use_ml=True) for n in range(5))
+    )
+
+    assert len(classify_calls) == 1
+    assert results == LABELS
+
+
+@pytest.mark.asyncio
+async def test_ml_failure_falls_back_to_keywords(monkeypatch):
+    def failing_classify_batch(texts):
+        raise RuntimeError("model exploded")
+
+    monkeypatch.setattr(emotion, "_classify_batch", failing_classify_batch)
+    emotion._emotion_cache.clear()
+    monkeypatch.setattr(emotion, "_last_result", None)
+
+    result = await detect_emotion_from_text_async(
+        "What a wonderful, amazing, fantastic day!", use_ml=True
+    )
+
+    assert result == "happy"
+
+
+def test_import_does_not_load_numba():
+    code = (
+        "import sys; import app.utils.emotion; "
+        "assert 'numba' not in sys.modules and 'app.utils.emotion_kernel' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(__file__))
+
+
+def test_numba_and_regex_paths_agree(monkeypatch):
+    pytest.importorskip("numba")
+    script = (
+        "I'm so happy and excited, this is AMAZING news! Sadly some were disappointed, "
+        "upset_or furious. Wow, unbelievable: great2 gladness glad. "
+    ) * 100
+    assert len(script) >= emotion.NUMBA_MIN_TEXT_LENGTH
+
+    emotion._compile_patterns()
+    numba_scores = emotion._numba_scorer(script)
+    regex_scores = {
+        name: len(pattern.findall(script.lower()))
+        for name, pattern in emotion._EMOTION_PATTERNS.items()
+    }
+
+    assert numba_scores == regex_scores
+
+
+def test_keyword_detection_without_numba(monkeypatch):
+    monkeypatch.setitem(sys.modules, "numba", None)
+    monkeypatch.delitem(sys.modules, "app.utils.emotion_kernel", raising=False)
+    monkeypatch.setattr(emotion, "_EMOTION_PATTERNS", None)
+    monkeypatch.setattr(emotion, "_numba_scorer", None)
+
+    script = "What a wonderful, amazing, fantastic day. " * 200
+    assert emotion._detect_emotion_keywords(script) == "happy"
+    assert emotion._numba_scorer is None
@@ -0,0 +1,58 @@
+"""Tests for structlog setup inside Celery workers."""
+import io
+import logging
+import sys
+
+import orjson
+import pytest
+import structlog
+from celery.utils.log import LoggingProxy
+
+from app.config import settings
+from app.workers.tasks import configure_worker_logging
+
+
+@pytest.fixture
+def worker_stdout(monkeypatch):
+    """
+    Production settings, plus a helper that redirects stdout the way a
+    Celery worker does (called from the test body: pytest re-installs its
+    own capture stream between setup and call).
+    """
+    monkeypatch.setattr(settings, "debug", False)
+
+    def redirect() -> LoggingProxy:
+        proxy = LoggingProxy(logging.getLogger("celery.redirected"), logging.WARNING)
+        monkeypatch.setattr(sys, "stdout", proxy)
+        return proxy
+
+    yield redirect
+    structlog.reset_defaults()
+
+
+def test_worker_logs_through_logging_proxy_stdout(worker_stdout, capfd):
+    worker_stdout()
+    assert not hasattr(sys.stdout, "buffer")
+
+    configure_worker_logging()
+    structlog.get_logger().info("render_started", job_id="job-1")
+
+    out, _ = capfd.readouterr()
+    record = orjson.loads(out.splitlines()[-1])
+    assert record["event"] == "render_started"
+    assert record["job_id"] == "job-1"
+    assert record["level"] == "info"
+
+
+def test_worker_logs_without_a_byte_stdout(worker_stdout, monkeypatch):
+    # No real stdout to write bytes to (e.g. pythonw, detached processes)
+    monkeypatch.setattr(sys, "__stdout__", io.StringIO())
+    proxy = worker_stdout()
+    messages = []
+    monkeypatch.setattr(proxy, "write", messages.append)
+
+    configure_worker_logging()
+    structlog.get_logger().info("render_started", job_id="job-1")
+
+    record = orjson.loads("".join(messages))
+    assert record["event"] == "render_started"
@@ -0,0 +1,118 @@
+"""Tests for verify_token's verified-payload cache."""
+import hashlib
+import time
+import uuid
+from datetime import timedelta
+
+import pytest
+
+from app.utils import security
+from app.utils.security import (
+    TOKEN_CACHE_TTL,
+    create_access_token,
+    create_refresh_token,
+    verify_token,
+)
+
+
+class _Clock:
+    """Controllable stand-in for security.time (jose keeps the real clock)."""
+
+    def __init__(self):
+        self.now = time.time()
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(security, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    security._token_cache.clear()
+    calls = []
+    real_decode = security.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(security.jwt, "decode", counting_decode)
+    yield calls
+    security._token_cache.clear()
+
+
+def _cache_entry(token):
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    return security._token_cache.get(key)
+
+
+def test_repeated_verification_is_served_from_cache(decode_calls):
+    token = create_access_token(uuid.uuid4(), "user@neura.ai")
+
+    first = verify_token(token)
+    second = verify_token(token)
+
+    assert first == second
+    assert len(decode_calls) == 1
+
+
+def test_cache_entry_is_capped_at_ttl(clock, decode_calls):
+    token = create_access_token(uuid.uuid4(), "user@neura.ai", timedelta(hours=1))
+
+    verify_token(token)
+    _, expires_at = _cache_entry(token)
+    assert expires_at == pytest.approx(clock.now + TOKEN_CACHE_TTL)
+
+    clock.now += TOKEN_CACHE_TTL + 1
+    assert verify_token(token) is not None
+    assert len(decode_calls) == 2
+
+
+def test_cache_entry_never_outlives_token_exp(clock, decode_calls):
+    token = create_access_token(uuid.uuid4(), "user@neura.ai", timedelta(seconds=60))
+    exp = security.jwt.get_unverified_claims(token)["exp"]
+
+    verify_token(token)
+    _, expires_at = _cache_entry(token)
+    assert expires_at == exp
+
+    # Still cached just before exp, decoded again (and checked by jose) after
+    clock.now = exp - 1
+    verify_token(token)
+    assert len(decode_calls) == 1
+
+    clock.now = exp
+    verify_token(token)
+    assert len(decode_calls) == 2
+
+
+def test_invalid_tokens_are_not_cached(decode_calls):
+    assert verify_token("not-a-jwt") is None
+    assert verify_token("not-a-jwt") is None
+    assert len(decode_calls) == 2
+
+
+def test_cached_payload_still_checks_token_type(decode_calls):
+    token = create_refresh_token(uuid.uuid4())
+
+    assert verify_token(token, token_type="refresh") is not None
+    assert verify_token(token, token_type="access") is None
+
+
+def test_callers_cannot_mutate_the_cached_payload(decode_calls):
+    token = create_access_token(uuid.uuid4(), "user@neura.ai")
+
+    payload = verify_token(token)
+    payload["sub"] = "someone-else"
+    payload.pop("email")
+
+    cached = verify_token(token)
+    assert cached["sub"] != "someone-else"
+    assert cached["email"] == "user@neura.ai"
+    assert len(decode_calls) == 1
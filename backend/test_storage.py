@@ -0,0 +1,162 @@
+"""Tests for StorageClient key generation, downloads and client lifecycle."""
+import asyncio
+import re
+import threading
+
+import pytest
+from botocore.exceptions import IncompleteReadError
+
+from app.utils.storage import _SAFE_FILENAME_TABLE, StorageClient
+
+
+def _reference_sanitize(filename: str) -> str:
+    """The original per-character sanitizer the translate tables replaced."""
+    return "".join(c if c.isalnum() or c in ".-_" else "_" for c in filename)
+
+
+FILENAMES = [
+    "video.mp4",
+    "My Video (final) v2.mp4",
+    "../../etc/passwd",
+    "a/b\\c:d*e?f\"g<h>i|j",
+    "tab\tnew\nline\r\x00nul\x7f.wav",
+    "".join(chr(c) for c in range(128)),
+    "café_naïve.wav",
+    "видео.mp4",
+    "动画 片段.mov",
+    "emoji 🎬 clip.mp4",
+    "٣٤ arabic digits.wav",
+    "",
+]
+
+
+@pytest.mark.parametrize("filename", FILENAMES)
+def test_generate_key_matches_reference_sanitizer(filename):
+    key = StorageClient.generate_key("videos", filename, unique=False)
+
+    assert key == f"videos/{_reference_sanitize(filename)}"
+
+
+@pytest.mark.parametrize("filename", FILENAMES)
+def test_unicode_table_matches_reference_sanitizer(filename):
+    assert filename.translate(_SAFE_FILENAME_TABLE) == _reference_sanitize(filename)
+
+
+def test_generate_key_with_user_and_unique_suffix():
+    key = StorageClient.generate_key("audio", "my voice.wav", user_id="user-1")
+
+    assert re.fullmatch(r"audio/user-1/[0-9a-f]{8}_my_voice\.wav", key)
+    assert key != StorageClient.generate_key("audio", "my voice.wav", user_id="user-1")
+
+
+class _Body:
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    async def iter_chunks(self, chunk_size):
+        for chunk in self._chunks:
+            yield chunk
+
+
+class _S3:
+    def __init__(self, content_length, chunks):
+        self.response = {"ContentLength": content_length, "Body": _Body(chunks)}
+
+    async def get_object(self, Bucket, Key):
+        return self.response
+
+
+def _client_returning(monkeypatch, content_length, chunks):
+    client = StorageClient()
+    s3 = _S3(content_length, chunks)
+
+    async def get_client():
+        return s3
+
+    monkeypatch.setattr(client, "_get_client", get_client)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_download_file_assembles_chunks(monkeypatch):
+    client = _client_returning(monkeypatch, 11, [b"hello", b" ", b"world"])
+
+    assert await client.download_file("bucket", "key") == b"hello world"
+
+
+@pytest.mark.asyncio
+async def test_download_file_rejects_truncated_body(monkeypatch):
+    client = _client_returning(monkeypatch, 11, [b"hello"])
+
+    with pytest.raises(IncompleteReadError):
+        await client.download_file("bucket", "key")
+
+
+@pytest.mark.asyncio
+async def test_download_file_rejects_oversized_body(monkeypatch):
+    client = _client_returning(monkeypatch, 5, [b"hello", b"!"])
+
+    with pytest.raises(IncompleteReadError):
+        await client.download_file("bucket", "key")
+
+
+class _ClientContext:
+    """Fake aioboto3 client context that records which loop closed it."""
+
+    def __init__(self):
+        self.closed_on = None
+
+    async def __aenter__(self):
+        return object()
+
+    async def __aexit__(self, *exc_info):
+        self.closed_on = asyncio.get_running_loop()
+
+
+class _Session:
+    def __init__(self):
+        self.contexts = []
+
+    def client(self, **kwargs):
+        self.contexts.append(_ClientContext())
+        return self.contexts[-1]
+
+
+def test_client_from_previous_loop_is_closed_on_that_loop():
+    client = StorageClient()
+    client.session = _Session()
+
+    old_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=old_loop.run_forever)
+    thread.start()
+    try:
+        asyncio.run_coroutine_threadsafe(client._get_client(), old_loop).result(timeout=5)
+
+        async def use_new_loop():
+            await client._get_client()
+            # Let the close scheduled on the old loop finish
+            for _ in range(100):
+                if client.session.contexts[0].closed_on is not None:
+                    break
+                await asyncio.sleep(0.01)
+
+        asyncio.run(use_new_loop())
+
+        assert len(client.session.contexts) == 2
+        assert client.session.contexts[0].closed_on is old_loop
+        assert client.session.contexts[1].closed_on is None
+    finally:
+        old_loop.call_soon_threadsafe(old_loop.stop)
+        thread.join(timeout=5)
+        old_loop.close()
+
+
+@pytest.mark.asyncio
+async def test_close_closes_the_running_loops_client():
+    client = StorageClient()
+    client.session = _Session()
+
+    await client._get_client()
+    await client.close()
+
+    assert client.session.contexts[0].closed_on is asyncio.get_running_loop()
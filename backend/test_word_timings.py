@@ -0,0 +1,37 @@
+"""Tests for parsing the TTS service's X-Word-Timings header."""
+import json
+
+import pytest
+
+from app.workers.tasks import parse_word_timings
+
+TIMINGS = [
+    {"word": "Hello", "start": 0.0, "end": 0.42},
+    {"word": "don't", "start": 0.42, "end": 0.8},
+    {"word": "café", "start": 0.8, "end": 1.25},
+    {"word": "世界", "start": 1.25, "end": 1.9},
+]
+
+
+def test_parses_json_header():
+    # What the TTS service sends now: json.dumps, non-ASCII escaped
+    assert parse_word_timings(json.dumps(TIMINGS)) == TIMINGS
+
+
+def test_parses_legacy_repr_header():
+    # Older TTS services sent str(list): single quotes, and double quotes
+    # around words containing an apostrophe
+    header = str(TIMINGS)
+    assert "'word'" in header and '"don\'t"' in header
+
+    assert parse_word_timings(header) == TIMINGS
+
+
+@pytest.mark.parametrize("header", ["", "[]"])
+def test_empty_header_gives_no_timings(header):
+    assert parse_word_timings(header) == []
+
+
+@pytest.mark.parametrize("header", ["not timings", "[{'word': 'Hello',", "{'word': __import__('os')}"])
+def test_malformed_header_gives_no_timings(header):
+    assert parse_word_timings(header) == []
@@ -33,6 +33,17 @@ avatar_renderer: Optional[AvatarRenderer] = None
 # Store render progress
 render_progress: Dict[str, RenderProgress] = {}
 
+# Set once a render job completes or fails; wakes long-polling status requests
+render_done: Dict[str, asyncio.Event] = {}
+
+# Upper bound for the status endpoint's ?wait= long-poll (seconds)
+MAX_STATUS_WAIT = 60.0
+
+
+def _is_render_finished(progress: RenderProgress) -> bool:
+    """Whether a render has reached a terminal state."""
+    return bool(progress.error) or progress.current_step == "Failed" or progress.progress >= 1.0
+
 
 class RenderRequest(BaseModel):
     """Request for video rendering."""
@@ -246,8 +257,12 @@ async def render_video(request: RenderRequest):
         raise HTTPException(status_code=500, detail=f"Setup failed: {str(e)}")
     
     # Progress callback
+    done_event = render_done[request.job_id] = asyncio.Event()
+    
     async def progress_callback(progress: RenderProgress):
         render_progress[request.job_id] = progress
+        if _is_render_finished(progress):
+            done_event.set()
     
     try:
         # Start rendering in background
@@ -305,15 +320,44 @@ async def _render_video_task(
             estimated_remaining=0,
             error=str(e)
         )
+        render_done.setdefault(job_id, asyncio.Event()).set()
 
 
 @app.get("/render/{job_id}/status")
-async def get_render_status(job_id: str):
-    """Get render job status."""
+async def get_render_status(job_id: str, wait: float = 0.0):
+    """
+    Get render job status.
+    
+    With ?wait=N the request is held until the render finishes or N seconds
+    pass (long-poll), so callers don't have to poll on a short interval.
+    """
+    done_event = render_done.get(job_id)
+    
+    if wait > 0 and done_event is not None and not done_event.is_set():
+        try:
+            await asyncio.wait_for(done_event.wait(), timeout=min(wait, MAX_STATUS_WAIT))
+        except asyncio.TimeoutError:
+            pass
+    
     progress = render_progress.get(job_id)
     
     if not progress:
-        raise HTTPException(status_code=404, detail="Job not found")
+        if done_event is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        # Accepted but the renderer hasn't reported yet
+        progress = RenderProgress(
+            current_frame=0,
+            total_frames=0,
+            current_step="Queued",
+            progress=0.0,
+            estimated_remaining=0,
+        )
+    elif done_event is not None and _is_render_finished(progress):
+        # Terminal status reached; the event is no longer needed (pollers
+        # already waiting hold their own reference). Leave a newer render
+        # registered under the same job_id alone.
+        if render_done.get(job_id) is done_event:
+            del render_done[job_id]
     
     return {
         "job_id": job_id,
@@ -323,7 +367,8 @@ async def get_render_status(job_id: str):
         "progress": progress.progress,
         "estimated_remaining": progress.estimated_remaining,
         "status": "failed" if progress.error or progress.current_step == "Failed" else ("completed" if progress.progress >= 1.0 else "processing"),
-        "error": progress.error
+        "error": progress.error,
+        "long_poll": True,
     }
 
 
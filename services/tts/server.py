@@ -1,6 +1,7 @@
 """TTS Service FastAPI Server."""
 import asyncio
 import io
+import json
 import os
 import tempfile
 from pathlib import Path
@@ -149,10 +150,14 @@ async def synthesize(request: SynthesizeRequest):
             headers={
                 "X-Duration": str(result.duration),
                 "X-Sample-Rate": str(result.sample_rate),
-                "X-Word-Timings": str([
-                    {"word": t.word, "start": t.start_time, "end": t.end_time}
-                    for t in result.word_timings
-                ]),
+                # Real JSON (ASCII-escaped, so non-ASCII words stay header-safe)
+                "X-Word-Timings": json.dumps(
+                    [
+                        {"word": t.word, "start": t.start_time, "end": t.end_time}
+                        for t in result.word_timings
+                    ],
+                    separators=(",", ":"),
+                ),
             },
         )
     except Exception as e: